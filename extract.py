@@ -1,21 +1,115 @@
 import pytesseract
+from pytesseract import Output
 import re
 import os
-import pandas as pd
+import hashlib
+import shutil
+import tempfile
+import functools
+import concurrent.futures
+from openpyxl import Workbook
 from datetime import datetime
 from utils import preprocess_image, load_image_pil
 from PIL import Image
 
+# tesserocr keeps Tesseract loaded in-process (no subprocess fork or stdio
+# pipe per image). It needs a compiled wheel, so treat it as optional and
+# fall back to pytesseract when unavailable.
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+    _HAS_TESSEROCR = True
+except ImportError:
+    _HAS_TESSEROCR = False
+
+# xlsxwriter in constant_memory mode streams rows to disk as they are
+# produced instead of materializing the whole workbook at the end
+try:
+    import xlsxwriter
+    _HAS_XLSXWRITER = True
+except ImportError:
+    _HAS_XLSXWRITER = False
+
 # Set Tesseract path if needed (User might need to configure this)
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# LSTM engine (--oem 1) plus block-of-text segmentation (--psm 6) suits
+# the receipt layout and beats the legacy engine on speed and accuracy
+_TESS_CONFIG = '--oem 1 --psm 6'
+
+# Precompiled line-prefix strippers for the Sender/Receiver heuristics
+_TO_PREFIX_RE = re.compile(r'^to\s*[:\-]?\s*', re.IGNORECASE)
+_FROM_PREFIX_RE = re.compile(r'^from\s*[:\-]?\s*', re.IGNORECASE)
+
+# Whole-word bank match — avoids false hits like "BankRef"
+_BANK_RE = re.compile(r'\bBank\b')
+
+# Line prefixes marking receiver/sender lines; matched against the
+# already-lowercased line in one C-level startswith call
+_TO_PREFIXES = ('to ', 'to:', 'to-', 'paid to')
+_FROM_PREFIXES = ('from ', 'from:', 'from-')
+
+@functools.lru_cache(maxsize=1)
+def _find_tesseract_cmd():
+    """
+    Probes common install paths for the Tesseract executable. Cached so
+    repeated extractor construction (UI reruns, pool workers in the same
+    process) pays the filesystem probes only once.
+
+    Returns the path to set as tesseract_cmd, or '' when Tesseract is
+    already on PATH (or was not found at all).
+    """
+    # Pool workers inherit the parent's result through the environment
+    # and skip the probes entirely
+    env_cmd = os.environ.get('UPI_TESSERACT_CMD')
+    if env_cmd:
+        return env_cmd
+
+    try:
+        pytesseract.get_tesseract_version()
+        return ''
+    except Exception:
+        pass
+
+    common_paths = [
+        r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+        r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+    ]
+    local_app = os.getenv('LOCALAPPDATA')
+    if local_app:
+        common_paths.append(os.path.join(local_app, r"Tesseract-OCR\tesseract.exe"))
+
+    for path in common_paths:
+        if os.path.exists(path):
+            return path
+    return ''
+
+
+# On-disk OCR cache keyed by image content hash; one file per key so
+# concurrent pool workers can read/write without locking
+_OCR_CACHE_DIR = os.path.expanduser('~/.upi_ocr_cache')
+
 class PaymentExtractor:
-    def __init__(self):
+    def __init__(self, use_cache=None):
         # Auto-detect Tesseract
         self.configure_tesseract()
-        
-        # Compiled regex for better performance and cleaner code
-        self.patterns = {
+
+        # OCR result cache (the env var only supplies the default when
+        # the caller passes nothing; pool runs pass it per batch)
+        if use_cache is None:
+            use_cache = os.environ.get('UPI_OCR_CACHE', '1') != '0'
+        self.use_cache = use_cache
+
+        # Persistent in-process Tesseract handle (fast path)
+        self.api = None
+        if _HAS_TESSEROCR:
+            try:
+                self.api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK)
+            except Exception:
+                self.api = None
+
+        # Raw patterns — compiled once below so the hot parse loop never
+        # hits re's internal cache
+        raw_patterns = {
             'amount': [
                 r'[₹Rs]\.?\s*([\d,]+\.?\d{0,2})',
                 r'Amount\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})',
@@ -53,40 +147,116 @@ class PaymentExtractor:
             ]
         }
 
+        # Compiled regex for better performance and cleaner code
+        self.patterns = {
+            key: [re.compile(p, re.IGNORECASE) for p in plist]
+            for key, plist in raw_patterns.items()
+        }
+
+        # One master alternation across every field: a single finditer
+        # pass tokenizes the whole text instead of one scan per pattern.
+        # Each alternative is wrapped in a named group '<field>_<i>'; its
+        # value capture (all patterns above have exactly one) sits right
+        # after the wrapper.
+        self.master = re.compile(
+            '|'.join(
+                f'(?P<{key}_{i}>{p})'
+                for key, plist in raw_patterns.items()
+                for i, p in enumerate(plist)
+            ),
+            re.IGNORECASE
+        )
+
     def configure_tesseract(self):
         """
         Attempts to find Tesseract executable in common paths.
         """
+        path = _find_tesseract_cmd()
+        if path:
+            pytesseract.pytesseract.tesseract_cmd = path
+
+    def close(self):
+        """
+        Release the in-process Tesseract handle, if any.
+        """
+        if self.api is not None:
+            self.api.End()
+            self.api = None
+
+    def __del__(self):
+        self.close()
+
+    @staticmethod
+    def _hash_image(image_path):
+        """
+        Content hash of an image file, used as the OCR cache key.
+        """
+        with open(image_path, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+    def _cache_get(self, image_path):
+        """
+        Returns (cache_key, cached_text). cached_text is None on a miss;
+        cache_key is None if the cache is unusable for this image.
+        """
+        try:
+            key = self._hash_image(image_path)
+            cache_file = os.path.join(_OCR_CACHE_DIR, key + '.txt')
+            if os.path.exists(cache_file):
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    return key, f.read()
+            return key, None
+        except OSError:
+            return None, None
+
+    @staticmethod
+    def _cache_put(key, text):
+        """
+        Stores OCR text under its content-hash key; failures are ignored.
+        """
         try:
-            pytesseract.get_tesseract_version()
-            return
-        except:
+            os.makedirs(_OCR_CACHE_DIR, exist_ok=True)
+            cache_file = os.path.join(_OCR_CACHE_DIR, key + '.txt')
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+        except OSError:
             pass
-            
-        common_paths = [
-            r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-            os.path.join(os.getenv('LOCALAPPDATA'), r"Tesseract-OCR\tesseract.exe")
-        ]
-        
-        for path in common_paths:
-            if os.path.exists(path):
-                pytesseract.pytesseract.tesseract_cmd = path
-                return
 
     def extract_text(self, image_path):
         """
         Extracts raw text from an image using Tesseract OCR.
+
+        Results are cached on disk by image content hash, so re-running
+        over overlapping folders skips Tesseract entirely on hits.
         """
+        cache_key = None
+        if self.use_cache:
+            cache_key, cached = self._cache_get(image_path)
+            if cached is not None:
+                return cached
+
         try:
             processed_img = preprocess_image(image_path)
-            if processed_img is not None:
-                # psm 6 is good for blocks of text, psm 4 or 3 might be better for full receipts
-                # We'll stick to default or try 6.
-                text = pytesseract.image_to_string(processed_img)
+
+            if self.api is not None:
+                # In-process OCR — no subprocess launch per image
+                if processed_img is not None:
+                    img = Image.fromarray(processed_img)
+                else:
+                    img = load_image_pil(image_path)
+                self.api.SetImage(img)
+                text = self.api.GetUTF8Text()
+            elif processed_img is not None:
+                # The ndarray goes straight to pytesseract — no PIL
+                # round-trip or extra PNG encode/decode
+                text = pytesseract.image_to_string(processed_img, config=_TESS_CONFIG)
             else:
-                img = load_image_pil(image_path)
-                text = pytesseract.image_to_string(img)
+                text = pytesseract.image_to_string(
+                    load_image_pil(image_path), config=_TESS_CONFIG
+                )
+
+            if cache_key is not None and text:
+                self._cache_put(cache_key, text)
             return text
         except Exception as e:
             # Silent fail with log is better for production
@@ -94,12 +264,183 @@ class PaymentExtractor:
                 f.write(f"{datetime.now()}: Error on {image_path}: {e}\n")
             return ""
 
-    def parse_details(self, text, filename):
+    def extract_data(self, image_path, min_conf=60):
+        """
+        Runs Tesseract once in data mode, returning both the text and the
+        confidence-filtered word boxes.
+
+        One image_to_data call yields per-word confidences and positions,
+        so low-confidence noise can be dropped and labels can be paired
+        with the values physically next to them on the receipt.
+        """
+        try:
+            processed_img = preprocess_image(image_path)
+            if processed_img is not None:
+                img = processed_img
+            else:
+                img = load_image_pil(image_path)
+            data = pytesseract.image_to_data(
+                img, config=_TESS_CONFIG, output_type=Output.DICT
+            )
+        except Exception as e:
+            with open("ocr_errors.log", "a") as f:
+                f.write(f"{datetime.now()}: Error on {image_path}: {e}\n")
+            return "", []
+
+        words = []
+        lines = {}
+        keys = zip(data['text'], data['conf'], data['left'], data['top'],
+                   data['width'], data['height'],
+                   data['block_num'], data['par_num'], data['line_num'])
+        for text, conf, left, top, width, height, block, par, line in keys:
+            text = text.strip()
+            if not text:
+                continue
+            # Rebuild full text from every word so nothing is lost...
+            lines.setdefault((block, par, line), []).append(text)
+            try:
+                conf = float(conf)
+            except (TypeError, ValueError):
+                continue
+            # ...but only keep confident words for spatial parsing
+            if conf > min_conf:
+                words.append((text, conf, left, top, width, height))
+
+        full_text = '\n'.join(
+            ' '.join(parts) for _, parts in sorted(lines.items())
+        )
+        return full_text, words
+
+    def extract_text_batch(self, image_paths):
+        """
+        OCR a batch of images with a single Tesseract invocation.
+
+        Tesseract accepts a text file listing one image path per line and
+        emits all pages separated by form-feeds, amortizing the process
+        startup and language-data load across the whole batch. Falls back
+        to per-image extract_text if the output doesn't line up (e.g. an
+        unreadable image in the batch).
+        """
+        if self.api is not None:
+            # Persistent in-process handle: no startup cost to amortize
+            return [self.extract_text(p) for p in image_paths]
+
+        # Serve cache hits first and only OCR the misses
+        texts = [None] * len(image_paths)
+        keys = [None] * len(image_paths)
+        if self.use_cache:
+            pending = []
+            for i, path in enumerate(image_paths):
+                keys[i], cached = self._cache_get(path)
+                if cached is not None:
+                    texts[i] = cached
+                else:
+                    pending.append(i)
+        else:
+            pending = list(range(len(image_paths)))
+
+        if pending:
+            ocr_texts = self._ocr_batch([image_paths[i] for i in pending])
+            for i, text in zip(pending, ocr_texts):
+                texts[i] = text
+                if keys[i] is not None and text:
+                    self._cache_put(keys[i], text)
+        return texts
+
+    def _ocr_batch(self, image_paths):
+        """
+        Single-invocation Tesseract OCR over a list of image files.
+
+        Each image goes through the same preprocessing and Tesseract
+        config as the per-image path — the frames are written as
+        temporary PNGs for the list file, so batching only amortizes the
+        process startup, it does not change what Tesseract sees.
+        """
+        tmp_dir = None
+        try:
+            tmp_dir = tempfile.mkdtemp(prefix='upi_ocr_batch_')
+            listed_paths = []
+            for i, path in enumerate(image_paths):
+                processed_img = preprocess_image(path)
+                if processed_img is not None:
+                    tmp_path = os.path.join(tmp_dir, f'{i}.png')
+                    Image.fromarray(processed_img).save(tmp_path)
+                    listed_paths.append(tmp_path)
+                else:
+                    # Undecodable here; let Tesseract try the original
+                    listed_paths.append(path)
+
+            list_file = os.path.join(tmp_dir, 'imglist.txt')
+            with open(list_file, 'w') as f:
+                f.write('\n'.join(listed_paths))
+
+            combined = pytesseract.image_to_string(list_file, config=_TESS_CONFIG)
+            texts = combined.split('\f')
+
+            # Trailing form-feed leaves an empty tail chunk
+            if len(texts) == len(image_paths) + 1 and not texts[-1].strip():
+                texts = texts[:-1]
+            if len(texts) == len(image_paths):
+                return texts
+        except Exception:
+            pass
+        finally:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # Fallback: per-image OCR
+        return [self.extract_text(p) for p in image_paths]
+
+    @staticmethod
+    def _words_to_lines(words):
+        """
+        Groups confidence-filtered word boxes into reading-order lines.
+        """
+        if not words:
+            return []
+        heights = sorted(w[5] for w in words)
+        line_h = max(heights[len(heights) // 2], 1)
+
+        bands = {}
+        for text, conf, left, top, width, height in words:
+            bands.setdefault(top // line_h, []).append((left, text))
+
+        return [
+            ' '.join(text for _, text in sorted(band))
+            for _, band in sorted(bands.items())
+        ]
+
+    def parse_details(self, text, filename, words=None):
+        """
+        Parses extracted text to find specific payment details.
+
+        When word boxes from extract_data are supplied, sender/receiver
+        labels are paired with the values beside them on the same line
+        band before falling back to the reflowed-text heuristics.
+
+        The text-only path is memoized: identical receipts (re-runs,
+        duplicate screenshots) skip the regex work entirely.
+        """
+        if words is None:
+            details = dict(self._parse_core_cached(text))
+        else:
+            details = self._parse_core(text, words)
+        details['File Name'] = filename
+        return details
+
+    @functools.lru_cache(maxsize=1024)
+    def _parse_core_cached(self, text):
+        """
+        Memoized text-only parse; callers must copy before mutating.
+        """
+        return self._parse_core(text)
+
+    def _parse_core(self, text, words=None):
         """
         Parses extracted text to find specific payment details.
         """
         details = {
-            'File Name': filename,
+            'File Name': '',
             'UPI Transaction ID': '',
             'Google Transaction ID': '',
             'Reference ID': '',
@@ -115,12 +456,27 @@ class PaymentExtractor:
             'All Extracted Text': text.strip()
         }
 
-        def find_match(pattern_key, target_text):
-            for pattern in self.patterns[pattern_key]:
-                match = re.search(pattern, target_text, re.IGNORECASE)
-                if match:
-                    return match.group(1) if match.groups() else match.group(0)
-            return ''
+        # Split once up front; both the regex pass and the line heuristics
+        # below reuse this. Joining the stripped lines also keeps the
+        # regex engine off whitespace-only lines entirely.
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        scan_text = '\n'.join(lines)
+
+        # Single tokenization pass: every field's matches land in its
+        # bucket in one O(N) traversal of the text
+        buckets = {key: [] for key in self.patterns}
+        for match in self.master.finditer(scan_text):
+            if not match.lastgroup:
+                continue
+            kind = match.lastgroup.rsplit('_', 1)[0]
+            # Map matched wrapper group back to its value capture
+            idx = match.re.groupindex[match.lastgroup]
+            value = match.group(idx + 1) if idx < match.re.groups else None
+            buckets[kind].append(value if value is not None else match.group(idx))
+
+        def find_match(pattern_key, _target_text=None):
+            bucket = buckets[pattern_key]
+            return bucket[0] if bucket else ''
 
         # Amount Cleaning
         raw_amount = find_match('amount', text)
@@ -148,16 +504,19 @@ class PaymentExtractor:
             details['Payment Status'] = 'PENDING'
 
         # Transaction IDs - Logic to differentiate
-        # Find all potential IDs
-        all_ids = []
-        for pattern in self.patterns['txn_id']:
-            all_ids.extend(re.findall(pattern, text, re.IGNORECASE))
-        
-        # Deduplicate and assign
-        for txn in set(all_ids):
+        # All potential IDs already collected by the master pass
+        all_ids = buckets['txn_id']
+
+        # Deduplicate in text order — the classification below cascades,
+        # so a stable order beats set()'s effectively random iteration.
+        # Strip first so whitespace variants collapse into one entry.
+        seen = set()
+        for txn in all_ids:
             txn = txn.strip()
-            if not txn: continue
-            
+            if not txn or txn in seen:
+                continue
+            seen.add(txn)
+
             if 'CIC' in txn or (len(txn) > 20 and not txn.isdigit()):
                 details['Google Transaction ID'] = txn
             elif txn.isdigit() and len(txn) >= 12:
@@ -167,56 +526,213 @@ class PaymentExtractor:
                 if len(txn) > 8:
                      details['UPI Transaction ID'] = txn
 
+        # Spatial pass: label/value pairs rebuilt from word boxes survive
+        # layouts where the reflowed text splits them apart
+        if words:
+            for line in self._words_to_lines(words):
+                low = line.lower()
+                if (low.startswith('to ') or low.startswith('paid to')) \
+                        and not details['To (Receiver)']:
+                    clean_line = _TO_PREFIX_RE.sub(
+                        '', re.sub(r'^paid\s+', '', line, flags=re.IGNORECASE)
+                    ).strip()
+                    if clean_line:
+                        details['To (Receiver)'] = clean_line
+                if low.startswith('from ') and not details['From (Sender)']:
+                    clean_line = _FROM_PREFIX_RE.sub('', line).strip()
+                    if clean_line:
+                        details['From (Sender)'] = clean_line
+
         # Heuristics for Sender/Receiver/Bank
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
         for i, line in enumerate(lines):
+            # Lowercase once per line; every check below reuses it
+            ll = line.lower()
+
             # Bank Name often contains "Bank"
-            if 'Bank' in line and not details['Bank Name']:
+            if not details['Bank Name'] and _BANK_RE.search(line):
                 # Avoid "Bank Reference No" etc.
-                if len(line) < 40 and not any(x in line.lower() for x in ['ref', 'id', 'no']):
+                if len(line) < 40 and not any(x in ll for x in ('ref', 'id', 'no')):
                     details['Bank Name'] = line
 
             # Receiver often follows "To" or is at the top
-            if (line.lower().startswith('to') or line.lower() == 'paid to') and not details['To (Receiver)']:
-                clean_line = re.sub(r'^to\s*[:\-]?\s*', '', line, flags=re.IGNORECASE).strip()
+            if (ll.startswith(_TO_PREFIXES) or ll in ('to', 'paid to')) and not details['To (Receiver)']:
+                # Strip a leading "Paid" before the "To" label, same as
+                # the spatial pass above — _TO_PREFIX_RE alone leaves
+                # "Paid to: X" untouched
+                clean_line = _TO_PREFIX_RE.sub(
+                    '', re.sub(r'^paid\s+', '', line, flags=re.IGNORECASE)
+                ).strip()
                 if clean_line:
                     details['To (Receiver)'] = clean_line
                 elif i + 1 < len(lines):
                     details['To (Receiver)'] = lines[i+1]
             
             # Sender
-            if line.lower().startswith('from') and not details['From (Sender)']:
-                clean_line = re.sub(r'^from\s*[:\-]?\s*', '', line, flags=re.IGNORECASE).strip()
+            if (ll.startswith(_FROM_PREFIXES) or ll == 'from') and not details['From (Sender)']:
+                clean_line = _FROM_PREFIX_RE.sub('', line).strip()
                 if clean_line:
                     details['From (Sender)'] = clean_line
                 elif i + 1 < len(lines):
                     details['From (Sender)'] = lines[i+1]
 
+            # All three heuristic fields found — no point scanning on
+            if details['Bank Name'] and details['To (Receiver)'] and details['From (Sender)']:
+                break
+
         return details
 
-    def process_images(self, image_paths, output_excel_path, progress_callback=None):
+    def process_images(self, image_paths, output_excel_path, progress_callback=None,
+                       executor=None):
         """
-        Processes a list of images and saves results to Excel.
+        Processes a list of images in parallel and saves results to Excel.
+
+        OCR runs in the Tesseract subprocess, so a process pool scales
+        near-linearly with CPU cores on multi-image batches. Rows are
+        streamed to the workbook as batches complete, keeping memory flat
+        regardless of batch size.
+
+        A caller-owned executor (e.g. the UI's long-lived pool) can be
+        passed in to avoid re-spawning workers on every run; it is left
+        running for the caller to shut down.
         """
         all_data = []
         total = len(image_paths)
-        
-        for i, img_path in enumerate(image_paths):
-            if progress_callback:
-                progress_callback(i + 1, total, f"Processing {os.path.basename(img_path)}...")
-            
-            raw_text = self.extract_text(img_path)
-            parsed_data = self.parse_details(raw_text, os.path.basename(img_path))
-            all_data.append(parsed_data)
-        
-        df = pd.DataFrame(all_data)
-        
+
+        # Keep Tesseract's internal OpenMP threads from fighting the pool
+        os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+        # Batch images so each worker amortizes one Tesseract launch
+        # across many files instead of one launch per image
+        batches = [
+            image_paths[i:i + _BATCH_SIZE]
+            for i in range(0, total, _BATCH_SIZE)
+        ]
+
         # Ensure output path ends with .xlsx
         if not output_excel_path.lower().endswith('.xlsx'):
             output_excel_path += '.xlsx'
-            
+
+        own_executor = executor is None
+        if own_executor:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                initializer=_init_worker,
+                initargs=(_find_tesseract_cmd(), self.use_cache),
+            )
+
         try:
-            df.to_excel(output_excel_path, index=False)
+            writer = _StreamingExcelWriter(output_excel_path) if _HAS_XLSXWRITER else None
+
+            done = 0
+            # The cache toggle rides along with every batch: long-lived
+            # pools (the UI's) keep workers across runs, so a setting
+            # baked in at spawn time would ignore later toggles
+            process = functools.partial(_process_batch, use_cache=self.use_cache)
+            for batch, parsed_batch in zip(batches, executor.map(process, batches)):
+                if writer is not None:
+                    writer.write_rows(parsed_batch)
+                else:
+                    all_data.extend(parsed_batch)
+                done += len(batch)
+                if progress_callback:
+                    progress_callback(done, total, f"Processed {done}/{total} images...")
+
+            if writer is not None:
+                writer.close()
+            else:
+                # Fallback: openpyxl write-only mode streams rows with no
+                # in-memory worksheet model and no pandas import at all
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+                if all_data:
+                    columns = list(all_data[0].keys())
+                    ws.append(columns)
+                    for record in all_data:
+                        ws.append([record.get(col, '') for col in columns])
+                wb.save(output_excel_path)
             return True, f"Successfully saved to {output_excel_path}"
         except Exception as e:
             return False, f"Error saving Excel: {e}"
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+
+class _StreamingExcelWriter:
+    """
+    Streams result rows straight into an xlsxwriter workbook opened in
+    constant_memory mode — memory stays O(1) in the number of rows and
+    the file write overlaps with OCR instead of happening at the end.
+    """
+    def __init__(self, output_path):
+        self.workbook = xlsxwriter.Workbook(
+            output_path, {'constant_memory': True}
+        )
+        self.worksheet = self.workbook.add_worksheet()
+        self.columns = None
+        self.row = 0
+
+    def write_rows(self, records):
+        for record in records:
+            if self.columns is None:
+                self.columns = list(record.keys())
+                self.worksheet.write_row(0, 0, self.columns)
+                self.row = 1
+            self.worksheet.write_row(
+                self.row, 0, [record.get(col, '') for col in self.columns]
+            )
+            self.row += 1
+
+    def close(self):
+        self.workbook.close()
+
+
+# Images per Tesseract list-file invocation; very long lists can make
+# Tesseract hang, so keep batches modest
+_BATCH_SIZE = 50
+
+# Worker-side extractor. Normally built by _init_worker at pool start;
+# the lazy guard in _process_batch covers executors created without the
+# initializer (e.g. a caller-owned pool).
+_worker_extractor = None
+
+def _init_worker(tesseract_cmd, use_cache):
+    """
+    Pool initializer: configures Tesseract and builds this worker's
+    extractor once at process start instead of on its first batch.
+    """
+    global _worker_extractor
+    if tesseract_cmd:
+        os.environ['UPI_TESSERACT_CMD'] = tesseract_cmd
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _worker_extractor = PaymentExtractor(use_cache=use_cache)
+
+def _process_batch(image_paths, use_cache=None):
+    """
+    OCR + parse a batch of images (top-level so it is picklable for the pool).
+
+    use_cache, when given, overrides the worker extractor's setting for
+    this batch — the caller's current toggle, not whatever the worker
+    was spawned with.
+    """
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = PaymentExtractor()
+    if use_cache is not None:
+        _worker_extractor.use_cache = use_cache
+
+    texts = _worker_extractor.extract_text_batch(image_paths)
+    results = []
+    for path, text in zip(image_paths, texts):
+        parsed = _worker_extractor.parse_details(text, os.path.basename(path))
+
+        # Spatial retry: when the reflowed text didn't yield a sender or
+        # receiver, re-run in data mode and pair labels with word boxes
+        if not parsed['To (Receiver)'] or not parsed['From (Sender)']:
+            data_text, word_boxes = _worker_extractor.extract_data(path)
+            if word_boxes:
+                parsed = _worker_extractor.parse_details(
+                    text or data_text, os.path.basename(path), words=word_boxes
+                )
+        results.append(parsed)
+    return results
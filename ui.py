@@ -5,10 +5,34 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import threading
 import os
+import concurrent.futures
 import webbrowser
-from extract import PaymentExtractor
+from extract import PaymentExtractor, _init_worker, _find_tesseract_cmd
 from datetime import datetime
 
+# Extensions accepted when scanning folders (no leading dot)
+IMAGE_EXTS = frozenset({'jpg', 'jpeg', 'png', 'bmp'})
+
+def _scan_images(root):
+    """
+    Recursively yields image paths under root using os.scandir, which
+    reuses the stat info from directory listing instead of re-stat'ing
+    every entry like os.walk + isfile would. Unreadable directories are
+    skipped, as os.walk's default onerror=None did.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_images(entry.path)
+            elif entry.is_file():
+                ext = entry.name.rpartition('.')[2].lower()
+                if ext in IMAGE_EXTS:
+                    yield entry.path
+
 class PaymentApp(ttk.Window):
     def __init__(self):
         # 'flatly' is a very clean, modern flat theme
@@ -17,10 +41,28 @@ class PaymentApp(ttk.Window):
         self.geometry("800x650")
         self.place_window_center()
         
-        self.extractor = PaymentExtractor()
+        # Built lazily on first extraction so the window paints before
+        # the Tesseract path probing and regex compilation run
+        self.extractor = None
         self.selected_files = []
-        
+
+        # Long-lived worker pool: spawning processes is expensive, so do
+        # it once here instead of per extraction run. Each worker
+        # preloads Tesseract and its extractor at start; the cache
+        # toggle travels with each batch, so workers that outlive a run
+        # still honour it.
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(_find_tesseract_cmd(), None),
+        )
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+
         self.create_widgets()
+
+    def on_closing(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
         
     def place_window_center(self):
         self.update_idletasks()
@@ -125,6 +167,16 @@ class PaymentApp(ttk.Window):
             state=DISABLED
         )
         self.start_btn.pack(pady=5)
+
+        # OCR cache toggle (skip Tesseract for images seen before)
+        self.use_cache_var = tk.BooleanVar(value=True)
+        cache_cb = ttk.Checkbutton(
+            action_frame,
+            text="Use OCR cache (skip unchanged images)",
+            variable=self.use_cache_var,
+            bootstyle="primary-round-toggle"
+        )
+        cache_cb.pack(pady=(0, 5))
         
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(
@@ -176,12 +228,7 @@ class PaymentApp(ttk.Window):
     def select_folder(self):
         folder = filedialog.askdirectory(title="Select Folder containing Images")
         if folder:
-            files = []
-            for root, _, filenames in os.walk(folder):
-                for filename in filenames:
-                    if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp')):
-                        files.append(os.path.join(root, filename))
-            self.selected_files = files
+            self.selected_files = list(_scan_images(folder))
             self.update_file_label()
 
     def update_file_label(self):
@@ -215,6 +262,9 @@ class PaymentApp(ttk.Window):
             messagebox.showwarning("Invalid Path", "Please select a valid output path.")
             return
             
+        if self.extractor is None:
+            self.extractor = PaymentExtractor()
+
         # Disable button
         self.start_btn.config(state=DISABLED)
         self.progress_var.set(0)
@@ -226,10 +276,12 @@ class PaymentApp(ttk.Window):
 
     def run_extraction_thread(self, output_name):
         try:
+            self.extractor.use_cache = self.use_cache_var.get()
             success, message = self.extractor.process_images(
-                self.selected_files, 
-                output_name, 
-                self.update_progress
+                self.selected_files,
+                output_name,
+                self.update_progress,
+                executor=self.pool
             )
             
             self.after(0, lambda: self.extraction_complete(success, message))
@@ -9,9 +9,67 @@ Supports multiple source types with specialized extraction:
 
 import re
 import os
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from upi_extractor.core.ocr_engine import OCREngine
 from upi_extractor.export.excel_exporter import export_to_excel
 
+# Precompiled helpers used by the parsers below — compiled once at import
+# so the per-image hot paths never touch re's internal pattern cache
+class _KeepNumericTable(dict):
+    """str.translate table keeping digits and '.', deleting all else."""
+
+    def __missing__(self, codepoint):
+        return None
+
+
+_AMOUNT_KEEP = _KeepNumericTable({ord(c): c for c in '0123456789.'})
+# Deletes the whitespace/dash separators OCR leaves inside account and
+# mobile numbers — a C-level translate instead of a regex sub per field
+_SEPARATOR_DELETE = str.maketrans('', '', ' \t\n\r\x0b\x0c-')
+_STANDALONE_ACC_RE = re.compile(r'^\s*(\d{9,18})\s*$')
+_STANDALONE_IFSC_RE = re.compile(r'^\s*([A-Z]{4}0[A-Z0-9]{6})\s*$')
+
+# Pattern key → output column for passbook fields filled by the category
+# finditer passes (account_holder stays on its priority-ordered loop)
+_PASSBOOK_FIELD_NAMES = {
+    'bank_name': 'Bank Name',
+    'account_number': 'Account Number',
+    'account_type': 'Account Type',
+    'ifsc_code': 'IFSC Code',
+    'micr_code': 'MICR Code',
+    'branch_name': 'Branch Name',
+    'cif_number': 'CIF Number',
+    'date_of_opening': 'Date of Opening',
+    'nomination': 'Nomination',
+    'joint_holder': 'Joint Holder',
+    'address': 'Address',
+    'mobile_number': 'Mobile Number',
+    'date': 'Date',
+    'transaction_type': 'Transaction Type',
+    'narration': 'Narration',
+    'reference_number': 'Reference Number',
+    'cheque_number': 'Cheque Number',
+    'credit_amount': 'Credit (₹)',
+    'debit_amount': 'Debit (₹)',
+    'balance': 'Balance (₹)',
+    'opening_balance': 'Opening Balance (₹)',
+    'closing_balance': 'Closing Balance (₹)',
+}
+
+# Shared amount sub-patterns for the passbook money fields. _AMT prefers
+# a decimal amount over a bare integer at the same position (replacing
+# the old decimal/integer alternative pairs); _AMT_LOOSE takes either.
+_AMT = r'[₹Rs]?\.?\s*([\d,]+\.\d{1,2}|[\d,]+)'
+_AMT_LOOSE = r'[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})'
+
+# Fields whose raw match goes through _clean_amount
+_PASSBOOK_AMOUNT_KEYS = frozenset({
+    'credit_amount', 'debit_amount', 'balance',
+    'opening_balance', 'closing_balance',
+})
+
 
 class PaymentExtractor:
     """
@@ -19,9 +77,16 @@ class PaymentExtractor:
     Coordinates OCR → parsing → export pipeline.
     """
 
+    # Entries kept in the parse-result cache (LRU eviction)
+    _PARSE_CACHE_MAX = 256
+
     def __init__(self):
         self.ocr = OCREngine()
 
+        # Duplicate screenshots produce identical OCR text; cache parse
+        # results by text so re-parsing them costs a dict lookup
+        self._parse_cache = OrderedDict()
+
         # ── UPI Screenshot Patterns ──────────────────────────────────
         self.patterns = {
             'amount': [
@@ -161,30 +226,28 @@ class PaymentExtractor:
 
             # ── Financial (only if visible on first page) ────────
             'credit_amount': [
-                r'(?:Credit|Credited)\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.\d{1,2})',
-                r'(?:Credit|Credited)\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+)',
-                r'(?:Deposit)\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})',
-                r'[₹Rs]\.?\s*([\d,]+\.?\d{0,2})\s*(?:Cr|Credit)',
+                rf'(?:Credit|Credited)\s*[:\-]?\s*{_AMT}',
+                rf'(?:Deposit)\s*[:\-]?\s*{_AMT_LOOSE}',
+                # Intra-line whitespace only: letting this cross a
+                # newline would pair an amount with the next line's label
+                r'[₹Rs]\.?[^\S\n]*([\d,]+\.?\d{0,2})[^\S\n]*(?:Cr|Credit)',
             ],
             'debit_amount': [
-                r'(?:Debit|Debited|Dr)\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.\d{1,2})',
-                r'(?:Debit|Debited|Dr)\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+)',
-                r'(?:Withdrawal|Withdraw)\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})',
-                r'[₹Rs]\.?\s*([\d,]+\.?\d{0,2})\s*(?:Dr|Debit)',
+                rf'(?:Debit|Debited|Dr)\s*[:\-]?\s*{_AMT}',
+                rf'(?:Withdrawal|Withdraw)\s*[:\-]?\s*{_AMT_LOOSE}',
+                r'[₹Rs]\.?[^\S\n]*([\d,]+\.?\d{0,2})[^\S\n]*(?:Dr|Debit)',
             ],
             'balance': [
-                r'(?:Available|Avl\.?)\s*Bal(?:ance)?\.?\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.\d{1,2})',
-                r'(?:Available|Avl\.?)\s*Bal(?:ance)?\.?\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+)',
-                r'Balance\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.\d{1,2})',
-                r'Balance\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+)',
+                rf'(?:Available|Avl\.?)\s*Bal(?:ance)?\.?\s*[:\-]?\s*{_AMT}',
+                rf'Balance\s*[:\-]?\s*{_AMT}',
             ],
             'opening_balance': [
-                r'(?:Opening|Open(?:ing)?\.?)\s*Bal(?:ance)?\.?\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})',
-                r'Op\.?\s*Bal\.?\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})',
+                rf'(?:Opening|Open(?:ing)?\.?)\s*Bal(?:ance)?\.?\s*[:\-]?\s*{_AMT_LOOSE}',
+                rf'Op\.?\s*Bal\.?\s*[:\-]?\s*{_AMT_LOOSE}',
             ],
             'closing_balance': [
-                r'(?:Closing|Clos(?:ing)?\.?)\s*Bal(?:ance)?\.?\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})',
-                r'Cl\.?\s*Bal\.?\s*[:\-]?\s*[₹Rs]?\.?\s*([\d,]+\.?\d{0,2})',
+                rf'(?:Closing|Clos(?:ing)?\.?)\s*Bal(?:ance)?\.?\s*[:\-]?\s*{_AMT_LOOSE}',
+                rf'Cl\.?\s*Bal\.?\s*[:\-]?\s*{_AMT_LOOSE}',
             ],
 
             # ── Transaction fields (may appear if statement) ─────
@@ -268,29 +331,210 @@ class PaymentExtractor:
              'Cheque Number', r'^\s*(\d{6,})\s*$'),
         ]
 
+        # ── Compile everything once ──────────────────────────────────
+        # The parse loops below run the compiled objects directly, so no
+        # call pays re's cache lookup or flag normalization again.
+        self.patterns = {
+            key: [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in plist]
+            for key, plist in self.patterns.items()
+        }
+        self.passbook_patterns = {
+            key: [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in plist]
+            for key, plist in self.passbook_patterns.items()
+        }
+        self._passbook_multiline_labels = [
+            (re.compile(label_re, re.IGNORECASE), field_key,
+             re.compile(value_re, re.IGNORECASE))
+            for label_re, field_key, value_re in self._passbook_multiline_labels
+        ]
+
+        # Status classification: one scan resolves the class through the
+        # matched group name — no .upper() copy or substring checks
+        self._status_re = re.compile(
+            r'(?P<succ>SUCCESS(?:FUL)?|COMPLETED)'
+            r'|(?P<fail>FAIL(?:ED|URE)?)'
+            r'|(?P<pend>PENDING|PROCESSING)',
+            re.IGNORECASE
+        )
+        self._status_map = {
+            'succ': 'SUCCESS', 'fail': 'FAILED', 'pend': 'PENDING',
+        }
+
+        # Sender/Receiver/Bank lines, matched on the full text with
+        # MULTILINE anchors instead of a Python per-line loop. Group 1 is
+        # the inline value; group 2 the next-line fallback used when the
+        # label stands alone. [^\S\n] = intra-line whitespace only.
+        self._to_line_re = re.compile(
+            r'^[^\S\n]*(?:paid[^\S\n]+)?to\b[^\S\n]*[:\-]?[^\S\n]*(\S[^\n]*)?$'
+            r'(?:(?:\n[^\S\n]*)+([^\n]+))?',
+            re.IGNORECASE | re.MULTILINE
+        )
+        self._from_line_re = re.compile(
+            r'^[^\S\n]*from\b[^\S\n]*[:\-]?[^\S\n]*(\S[^\n]*)?$'
+            r'(?:(?:\n[^\S\n]*)+([^\n]+))?',
+            re.IGNORECASE | re.MULTILINE
+        )
+        # Case-sensitive on purpose, matching the old `'Bank' in line`
+        self._bank_line_re = re.compile(r'^[^\n]*\bBank\b[^\n]*$', re.MULTILINE)
+
+        # One alternation over every multi-line label: the line scanner
+        # asks "is this a label line?" with a single regex call and maps
+        # the matched group back to its (field, value-pattern) pair
+        self._multiline_label_re = re.compile(
+            '|'.join(
+                f'(?P<L{i}>{label.pattern})'
+                for i, (label, _, _) in enumerate(self._passbook_multiline_labels)
+            ),
+            re.IGNORECASE
+        )
+        self._multiline_fields = [
+            (field_key, value_re)
+            for _, field_key, value_re in self._passbook_multiline_labels
+        ]
+
+        # Fuse each field's alternatives into one alternation so
+        # _find_match scans the text once per field instead of once per
+        # alternative. Every original pattern keeps its capture group,
+        # so the first non-None group of a match is the field value.
+        def _combine(plist):
+            return re.compile(
+                '|'.join(f'(?:{p.pattern})' for p in plist),
+                re.IGNORECASE | re.MULTILINE
+            )
+
+        self.patterns_combined = {
+            key: _combine(plist) for key, plist in self.patterns.items()
+        }
+        self.passbook_patterns_combined = {
+            key: _combine(plist) for key, plist in self.passbook_patterns.items()
+        }
+
+        # Sentinel literals per field: every alternative for these keys
+        # requires one of the listed substrings, so a cheap lowercase
+        # containment check can veto the regex scan outright. Only fields
+        # whose patterns all carry a literal are listed — a false
+        # positive merely costs the normal scan.
+        self._field_sentinels = {
+            'upi_id': ('@',),
+            'time': (':',),
+            'txn_id': ('txn', 'transaction', 'ref', 'utr', 'debited'),
+            'account_holder': ('holder', 'customer', 'name',
+                               'mr', 'ms', 'shri', 'smt', 'sri'),
+            'micr_code': ('micr',),
+            'cif_number': ('cif', 'customer'),
+            'mobile_number': ('mobile', 'phone', 'contact', 'mob'),
+            'cheque_number': ('cheque', 'chq'),
+        }
+
+        # Prebound finders for the two pattern sets — hot paths call
+        # these directly instead of routing through _find_match's
+        # pattern_dict dispatch
+        self._find_screenshot = self._make_finder(
+            self.patterns, self.patterns_combined
+        )
+        self._find_passbook = self._make_finder(
+            self.passbook_patterns, self.passbook_patterns_combined
+        )
+
+        # Category regexes: one finditer pass over the text fills a whole
+        # group of related fields instead of ~25 independent scans. Group
+        # names encode '<pattern_key>__<alt#>'; each alternative's single
+        # capture group sits right after its named wrapper.
+        def _category(keys):
+            return re.compile(
+                '|'.join(
+                    f'(?P<{key}__{i}>{p.pattern})'
+                    for key in keys
+                    for i, p in enumerate(self.passbook_patterns[key])
+                ),
+                re.IGNORECASE | re.MULTILINE
+            )
+
+        # credit/debit amounts stay out (they are priority fields — text
+        # order would let a balance line steal them), as does
+        # transaction_type (its code usually sits inside the narration's
+        # span, which a non-overlapping finditer would consume first)
+        self._passbook_categories = [
+            # Financial amounts
+            _category(['balance', 'opening_balance', 'closing_balance']),
+            # Account identity and bank codes
+            _category(['account_number', 'account_type', 'ifsc_code',
+                       'micr_code', 'cif_number', 'mobile_number']),
+            # Bank, branch and transaction metadata
+            _category(['bank_name', 'branch_name', 'date_of_opening',
+                       'nomination', 'joint_holder', 'address', 'date',
+                       'narration', 'reference_number',
+                       'cheque_number']),
+        ]
+
     # ══════════════════════════════════════════════════════════════════
     #  COMMON HELPERS
     # ══════════════════════════════════════════════════════════════════
 
+    # Fields whose list order encodes priority that a leftmost-match
+    # alternation would break (e.g. the salutation fallback for names
+    # must not outrank an explicit "Account Holder:" label further down,
+    # and the loose Cr/Dr suffix fallbacks must not outrank an explicit
+    # "Credit:"/"Debit:" label)
+    _PRIORITY_FIELDS = frozenset({'account_holder',
+                                  'credit_amount', 'debit_amount'})
+
+    def _make_finder(self, pattern_dict, combined_dict):
+        """
+        Build a find(pattern_key, text) closure bound to one pattern set.
+
+        Most fields run one fused alternation (a single text scan);
+        priority-sensitive fields keep the ordered per-pattern loop.
+        Fields with sentinel literals skip the regex work entirely when
+        none of the literals occur in the text. Binding the lookups as
+        closure locals avoids the per-call attribute and dict resolution
+        the old pattern_dict argument required.
+        """
+        sentinels_get = self._field_sentinels.get
+        combined_get = combined_dict.get
+        lists_get = pattern_dict.get
+        priority = self._PRIORITY_FIELDS
+
+        def find(pattern_key, text, text_lc=None):
+            sentinels = sentinels_get(pattern_key)
+            if sentinels:
+                if text_lc is None:
+                    text_lc = text.lower()
+                if not any(s in text_lc for s in sentinels):
+                    return ''
+
+            if pattern_key not in priority:
+                combined = combined_get(pattern_key)
+                if combined is None:
+                    return ''
+                match = combined.search(text)
+                if not match:
+                    return ''
+                value = next((g for g in match.groups() if g is not None), None)
+                return (value if value is not None else match.group(0)).strip()
+
+            for pattern in lists_get(pattern_key, ()):
+                match = pattern.search(text)
+                if match:
+                    return match.group(1).strip() if match.groups() else match.group(0).strip()
+            return ''
+
+        return find
+
     def _find_match(self, pattern_key, text, pattern_dict=None):
-        """Search text for the first match in a pattern group."""
-        patterns = (pattern_dict or self.patterns).get(pattern_key, [])
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                return match.group(1).strip() if match.groups() else match.group(0).strip()
-        return ''
+        """Dispatch to the prebound screenshot or passbook finder."""
+        if pattern_dict is None or pattern_dict is self.patterns:
+            return self._find_screenshot(pattern_key, text)
+        return self._find_passbook(pattern_key, text)
 
     def _clean_amount(self, raw):
         """Remove commas/spaces from an amount string, validate as number."""
         if not raw:
             return ''
-        clean = re.sub(r'[^\d\.]', '', raw)
-        try:
-            float(clean)
+        clean = raw.translate(_AMOUNT_KEEP)
+        if clean and clean.count('.') <= 1 and clean.replace('.', '').isdigit():
             return clean
-        except ValueError:
-            return raw
+        return raw
 
     # ══════════════════════════════════════════════════════════════════
     #  PASSBOOK EXTRACTION
@@ -313,41 +557,40 @@ class PaymentExtractor:
         lines = [line.strip() for line in text.split('\n')]
         num_lines = len(lines)
 
-        def _get_next_nonempty(start_idx):
-            """Find next non-empty line after start_idx, skipping blanks."""
-            j = start_idx + 1
-            while j < num_lines and not lines[j].strip():
-                j += 1
-            if j < num_lines:
-                return lines[j].strip()
-            return ''
+        # Next non-empty line for every index, built in one backward pass
+        # instead of re-scanning forward from each label line
+        next_text = [''] * num_lines
+        following = ''
+        for i in range(num_lines - 1, -1, -1):
+            next_text[i] = following
+            if lines[i]:
+                following = lines[i]
 
         for i, line in enumerate(lines):
             if not line:
                 continue
 
-            next_line = _get_next_nonempty(i)
-
-            # ── Check each multi-line label pattern ──
-            for label_re, field_key, value_re in self._passbook_multiline_labels:
-                if details.get(field_key):
-                    continue
+            next_line = next_text[i]
 
-                if re.search(label_re, line, re.IGNORECASE):
-                    if next_line:
-                        val_match = re.match(value_re, next_line, re.IGNORECASE)
-                        if val_match:
-                            details[field_key] = val_match.group(1).strip()
+            # ── Single alternation identifies the label (if any) ──
+            label_match = self._multiline_label_re.search(line)
+            if label_match and label_match.lastgroup and next_line:
+                idx = int(label_match.lastgroup[1:])
+                field_key, value_re = self._multiline_fields[idx]
+                if not details.get(field_key):
+                    val_match = value_re.match(next_line)
+                    if val_match:
+                        details[field_key] = val_match.group(1).strip()
 
             # ── Standalone account number (line of 9-18 digits only) ──
             if not details.get('Account Number'):
-                acc_match = re.match(r'^\s*(\d{9,18})\s*$', line)
+                acc_match = _STANDALONE_ACC_RE.match(line)
                 if acc_match:
                     details['Account Number'] = acc_match.group(1)
 
             # ── Standalone IFSC ──
             if not details.get('IFSC Code'):
-                ifsc_match = re.match(r'^\s*([A-Z]{4}0[A-Z0-9]{6})\s*$', line)
+                ifsc_match = _STANDALONE_IFSC_RE.match(line)
                 if ifsc_match:
                     val = ifsc_match.group(1)
                     if val != details.get('MICR Code'):
@@ -368,51 +611,62 @@ class PaymentExtractor:
         Returns:
             dict: Extracted passbook fields.
         """
-        pb = self.passbook_patterns
-
         # ── Pass 1: Regex extraction (inline label:value) ──
         details = {
             # ─ Identity ─
             'File Name': filename,
-            'Bank Name': self._find_match('bank_name', text, pb),
-            'Account Holder': self._find_match('account_holder', text, pb),
-            'Account Number': self._find_match('account_number', text, pb),
-            'Account Type': self._find_match('account_type', text, pb),
+            'Bank Name': '',
+            'Account Holder': self._find_passbook('account_holder', text),
+            'Account Number': '',
+            'Account Type': '',
             # ─ Bank codes ─
-            'IFSC Code': self._find_match('ifsc_code', text, pb),
-            'MICR Code': self._find_match('micr_code', text, pb),
-            'Branch Name': self._find_match('branch_name', text, pb),
-            'CIF Number': self._find_match('cif_number', text, pb),
+            'IFSC Code': '',
+            'MICR Code': '',
+            'Branch Name': '',
+            'CIF Number': '',
             # ─ First-page extras ─
-            'Date of Opening': self._find_match('date_of_opening', text, pb),
-            'Nomination': self._find_match('nomination', text, pb),
-            'Joint Holder': self._find_match('joint_holder', text, pb),
-            'Address': self._find_match('address', text, pb),
-            'Mobile Number': self._find_match('mobile_number', text, pb),
+            'Date of Opening': '',
+            'Nomination': '',
+            'Joint Holder': '',
+            'Address': '',
+            'Mobile Number': '',
             # ─ Transaction / Financial ─
-            'Date': self._find_match('date', text, pb),
-            'Transaction Type': self._find_match('transaction_type', text, pb),
-            'Narration': self._find_match('narration', text, pb),
-            'Reference Number': self._find_match('reference_number', text, pb),
-            'Cheque Number': self._find_match('cheque_number', text, pb),
+            # Credit/Debit run the ordered per-pattern finder so the
+            # explicit labels beat the Cr/Dr suffix fallbacks; the type
+            # code gets its own scan because it often sits inside the
+            # narration's span, which the category pass consumes whole
+            'Date': '',
+            'Transaction Type': self._find_passbook('transaction_type', text),
+            'Narration': '',
+            'Reference Number': '',
+            'Cheque Number': '',
             'Credit (₹)': self._clean_amount(
-                self._find_match('credit_amount', text, pb)
-            ),
+                self._find_passbook('credit_amount', text)),
             'Debit (₹)': self._clean_amount(
-                self._find_match('debit_amount', text, pb)
-            ),
-            'Balance (₹)': self._clean_amount(
-                self._find_match('balance', text, pb)
-            ),
-            'Opening Balance (₹)': self._clean_amount(
-                self._find_match('opening_balance', text, pb)
-            ),
-            'Closing Balance (₹)': self._clean_amount(
-                self._find_match('closing_balance', text, pb)
-            ),
+                self._find_passbook('debit_amount', text)),
+            'Balance (₹)': '',
+            'Opening Balance (₹)': '',
+            'Closing Balance (₹)': '',
             'All Extracted Text': text.strip(),
         }
 
+        # One finditer pass per category fills every remaining field,
+        # keeping first-hit semantics via the emptiness check
+        for category_re in self._passbook_categories:
+            for match in category_re.finditer(text):
+                if not match.lastgroup:
+                    continue
+                key = match.lastgroup.rsplit('__', 1)[0]
+                field = _PASSBOOK_FIELD_NAMES[key]
+                if details[field]:
+                    continue
+                idx = match.re.groupindex[match.lastgroup]
+                value = match.group(idx + 1) if idx < match.re.groups else None
+                value = (value if value is not None else match.group(idx)).strip()
+                if key in _PASSBOOK_AMOUNT_KEYS:
+                    value = self._clean_amount(value)
+                details[field] = value
+
         # ── Pass 2: Line scanner for multi-line gaps ──
         self._scan_passbook_lines(text, details)
 
@@ -422,8 +676,8 @@ class PaymentExtractor:
 
         # Clean account number — remove spaces/dashes
         if details['Account Number']:
-            details['Account Number'] = re.sub(
-                r'[\s\-]', '', details['Account Number']
+            details['Account Number'] = details['Account Number'].translate(
+                _SEPARATOR_DELETE
             )
 
         # Normalize account type
@@ -450,8 +704,8 @@ class PaymentExtractor:
 
         # Clean mobile number — remove spaces/dashes
         if details.get('Mobile Number'):
-            details['Mobile Number'] = re.sub(
-                r'[\s\-]', '', details['Mobile Number']
+            details['Mobile Number'] = details['Mobile Number'].translate(
+                _SEPARATOR_DELETE
             )
 
         return details
@@ -465,6 +719,10 @@ class PaymentExtractor:
         Parse extracted OCR text into structured payment details.
         Routes to passbook-specific parser when source_type is 'passbook'.
 
+        Parsing is pure in (text, source_type), so results are memoized
+        in an LRU dict; duplicate OCR texts cost one lookup plus a
+        shallow copy with the filename stamped in.
+
         Args:
             text (str): Raw OCR text.
             filename (str): Source image filename.
@@ -473,13 +731,28 @@ class PaymentExtractor:
         Returns:
             dict: Extracted payment fields.
         """
+        key = (source_type, text)
+        cached = self._parse_cache.get(key)
+        if cached is None:
+            cached = self._parse_core(text, source_type)
+            self._parse_cache[key] = cached
+            if len(self._parse_cache) > self._PARSE_CACHE_MAX:
+                self._parse_cache.popitem(last=False)
+        else:
+            self._parse_cache.move_to_end(key)
+        details = dict(cached)
+        details['File Name'] = filename
+        return details
+
+    def _parse_core(self, text, source_type):
+        """Uncached parse of OCR text (no filename — wrapper stamps it)."""
         # Passbook mode → dedicated parser with banking fields
         if source_type == 'passbook':
-            return self._parse_passbook_details(text, filename)
+            return self._parse_passbook_details(text, '')
 
         # Default UPI screenshot parsing
         details = {
-            'File Name': filename,
+            'File Name': '',
             'UPI Transaction ID': '',
             'Google Transaction ID': '',
             'Reference ID': '',
@@ -495,69 +768,73 @@ class PaymentExtractor:
             'All Extracted Text': text.strip(),
         }
 
+        # Lowercase shadow computed once per image; the sentinel probes
+        # all run against it instead of re-folding the text per field
+        text_lc = text.lower()
+
         # --- Amount ---
         details['Amount'] = self._clean_amount(
-            self._find_match('amount', text)
+            self._find_screenshot('amount', text, text_lc)
         )
 
         # --- UPI ID, Date, Time ---
-        details['UPI ID / VPA'] = self._find_match('upi_id', text)
-        details['Date'] = self._find_match('date', text)
-        details['Time'] = self._find_match('time', text)
+        details['UPI ID / VPA'] = self._find_screenshot('upi_id', text, text_lc)
+        details['Date'] = self._find_screenshot('date', text, text_lc)
+        details['Time'] = self._find_screenshot('time', text, text_lc)
 
         # --- Payment Status ---
-        status_raw = self._find_match('status', text).upper()
-        if 'SUCCESS' in status_raw or 'COMPLETED' in status_raw:
-            details['Payment Status'] = 'SUCCESS'
-        elif 'FAIL' in status_raw:
-            details['Payment Status'] = 'FAILED'
-        elif 'PENDING' in status_raw or 'PROCESSING' in status_raw:
-            details['Payment Status'] = 'PENDING'
+        status_match = self._status_re.search(text)
+        if status_match and status_match.lastgroup:
+            details['Payment Status'] = self._status_map[status_match.lastgroup]
 
         # --- Transaction IDs (differentiate by format) ---
-        all_ids = []
-        for pattern in self.patterns['txn_id']:
-            all_ids.extend(re.findall(pattern, text, re.IGNORECASE))
-
-        for txn in set(all_ids):
-            txn = txn.strip()
-            if not txn:
+        # One finditer over the fused txn_id alternation instead of seven
+        # findall passes; each hit is classified inline in text order and
+        # the scan stops once all three ID slots are filled.
+        seen_ids = set()
+        txn_iter = (
+            self.patterns_combined['txn_id'].finditer(text)
+            if any(s in text_lc for s in self._field_sentinels['txn_id'])
+            else ()
+        )
+        for match in txn_iter:
+            txn = next((g for g in match.groups() if g), '').strip()
+            if not txn or txn in seen_ids:
                 continue
+            seen_ids.add(txn)
             if 'CIC' in txn or (len(txn) > 20 and not txn.isdigit()):
-                details['Google Transaction ID'] = txn
+                if not details['Google Transaction ID']:
+                    details['Google Transaction ID'] = txn
             elif txn.isdigit() and len(txn) >= 12:
-                details['Reference ID'] = txn
+                if not details['Reference ID']:
+                    details['Reference ID'] = txn
             elif len(txn) > 8:
-                details['UPI Transaction ID'] = txn
-
-        # --- Sender / Receiver / Bank (heuristic line scan) ---
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        for i, line in enumerate(lines):
-            if 'Bank' in line and not details['Bank Name']:
-                if len(line) < 40 and not any(
-                    x in line.lower() for x in ['ref', 'id', 'no']
-                ):
-                    details['Bank Name'] = line
-
-            if (
-                line.lower().startswith('to') or line.lower() == 'paid to'
-            ) and not details['To (Receiver)']:
-                clean = re.sub(
-                    r'^to\s*[:\-]?\s*', '', line, flags=re.IGNORECASE
-                ).strip()
-                if clean:
-                    details['To (Receiver)'] = clean
-                elif i + 1 < len(lines):
-                    details['To (Receiver)'] = lines[i + 1]
-
-            if line.lower().startswith('from') and not details['From (Sender)']:
-                clean = re.sub(
-                    r'^from\s*[:\-]?\s*', '', line, flags=re.IGNORECASE
-                ).strip()
-                if clean:
-                    details['From (Sender)'] = clean
-                elif i + 1 < len(lines):
-                    details['From (Sender)'] = lines[i + 1]
+                if not details['UPI Transaction ID']:
+                    details['UPI Transaction ID'] = txn
+            if (details['Google Transaction ID'] and details['Reference ID']
+                    and details['UPI Transaction ID']):
+                break
+
+        # --- Sender / Receiver / Bank (full-text multiline regexes) ---
+        to_match = self._to_line_re.search(text)
+        if to_match:
+            value = (to_match.group(1) or to_match.group(2) or '').strip()
+            if value:
+                details['To (Receiver)'] = value
+
+        from_match = self._from_line_re.search(text)
+        if from_match:
+            value = (from_match.group(1) or from_match.group(2) or '').strip()
+            if value:
+                details['From (Sender)'] = value
+
+        for bank_match in self._bank_line_re.finditer(text):
+            line = bank_match.group(0).strip()
+            if len(line) < 40 and not any(
+                x in line.lower() for x in ('ref', 'id', 'no')
+            ):
+                details['Bank Name'] = line
+                break
 
         return details
 
@@ -582,6 +859,14 @@ class PaymentExtractor:
         all_data, summary = self.extract_all(image_paths, progress_callback, source_type)
         return export_to_excel(all_data, output_excel_path)
 
+    @staticmethod
+    def _missing_key_fields(details):
+        """True when parsing recovered none of the fields that matter."""
+        return not (details.get('Amount')
+                    or details.get('UPI Transaction ID')
+                    or details.get('Credit (₹)')
+                    or details.get('Debit (₹)'))
+
     def extract_all(self, image_paths, progress_callback=None, source_type="auto"):
         """
         OCR + parse only — returns extracted data without exporting.
@@ -598,39 +883,62 @@ class PaymentExtractor:
 
         Returns:
             tuple: (list[dict], dict) — extracted data and summary stats.
-                   Summary keys: 'success', 'failed', 'duplicates', 'errors'
+                   Summary keys: 'success', 'failed', 'duplicates',
+                   'retried', 'errors'
         """
         all_data = []
         total = len(image_paths)
         seen_hashes = set()
+        # Resolved once up front rather than per iteration of the hot loop
+        basenames = list(map(os.path.basename, image_paths))
 
         summary = {
             'success': 0,
             'failed': 0,
             'duplicates': 0,
+            'retried': 0,
             'errors': [],  # list of (filename, error_message)
         }
 
-        for i, img_path in enumerate(image_paths):
-            filename = os.path.basename(img_path)
-
-            if progress_callback:
-                progress_callback(
-                    i + 1, total, f"Processing {filename}..."
-                )
-
+        # ── Byte-identical files never reach OCR ──
+        # Re-dropped folders and copied screenshots are caught by a
+        # content hash before submission. The disk cache alone can't
+        # cover this: two copies submitted in parallel both miss it on
+        # first sight and both pay full OCR. Hashing is ~1-3 ms/file
+        # against 50-500 ms of OCR.
+        first_seen = {}
+        duplicate_file = [False] * total
+        for i, path in enumerate(image_paths):
             try:
-                raw_text = self.ocr.extract_text(img_path, source_type=source_type)
-                parsed_data = self.parse_details(
-                    raw_text, filename, source_type=source_type
-                )
+                with open(path, 'rb') as f:
+                    file_digest = hashlib.blake2b(
+                        f.read(), digest_size=16
+                    ).digest()
+            except OSError:
+                continue
+            if file_digest in first_seen:
+                duplicate_file[i] = True
+            else:
+                first_seen[file_digest] = i
+
+        # OCR dominates the per-image cost and releases the GIL inside
+        # Tesseract, so run it on a thread pool while this loop parses
+        # results in submission order — output stays deterministic, but
+        # image N+1 is being OCR'd while image N is parsed.
+        with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as pool:
+            ocr_futures = [
+                None if duplicate_file[i]
+                else pool.submit(self.ocr.extract_text, p, source_type=source_type)
+                for i, p in enumerate(image_paths)
+            ]
+            for i, (filename, future) in enumerate(zip(basenames, ocr_futures)):
 
-                # ── Duplicate detection (hash key fields, not raw text) ──
-                key_fields = {k: v for k, v in parsed_data.items()
-                              if k not in ('File Name', 'All Extracted Text') and v}
-                data_hash = hash(frozenset(key_fields.items()))
+                if progress_callback:
+                    progress_callback(
+                        i + 1, total, f"Processing {filename}..."
+                    )
 
-                if data_hash in seen_hashes:
+                if future is None:
                     summary['duplicates'] += 1
                     if progress_callback:
                         progress_callback(
@@ -638,23 +946,73 @@ class PaymentExtractor:
                         )
                     continue
 
-                seen_hashes.add(data_hash)
-                all_data.append(parsed_data)
-                summary['success'] += 1
-
-            except Exception as e:
-                summary['failed'] += 1
-                summary['errors'].append((filename, str(e)))
-                # Create error record so user can see it in the table
-                all_data.append({
-                    'File Name': filename,
-                    'Error': str(e),
-                })
-                if progress_callback:
-                    progress_callback(
-                        i + 1, total, f"❌ Error: {filename} — {e}"
+                try:
+                    raw_text = future.result()
+
+                    # parse_details memoizes by (source_type, text), so
+                    # duplicate OCR texts cost a lookup + shallow copy
+                    parsed_data = self.parse_details(
+                        raw_text, filename, source_type=source_type
                     )
 
+                    # ── Two-tier OCR: retry hard images with sparse PSM ──
+                    # The first pass uses the cheap per-source layout; only
+                    # when it yields none of the key fields does the image
+                    # pay for a second OCR with sparse segmentation, which
+                    # often recovers text the block pass merged or skipped.
+                    if self._missing_key_fields(parsed_data):
+                        retry_text = self.ocr.extract_text(
+                            image_paths[i], source_type=source_type,
+                            sparse=True,
+                        )
+                        retry_data = self.parse_details(
+                            retry_text, filename, source_type=source_type
+                        )
+                        if not self._missing_key_fields(retry_data):
+                            parsed_data = retry_data
+                            summary['retried'] += 1
+
+                    # ── Duplicate detection (hash key fields, not raw text) ──
+                    # blake2b over a canonical key-sorted byte stream: no
+                    # frozenset allocation, and the digest is stable across
+                    # runs (unlike PYTHONHASHSEED-randomized hash()), so
+                    # seen_hashes could be persisted between invocations.
+                    digest = hashlib.blake2b(digest_size=16)
+                    for k in sorted(parsed_data):
+                        v = parsed_data[k]
+                        if k in ('File Name', 'All Extracted Text') or not v:
+                            continue
+                        digest.update(k.encode())
+                        digest.update(b'\x00')
+                        digest.update(str(v).encode())
+                        digest.update(b'\x01')
+                    data_hash = digest.digest()
+
+                    if data_hash in seen_hashes:
+                        summary['duplicates'] += 1
+                        if progress_callback:
+                            progress_callback(
+                                i + 1, total, f"⏭️ Skipped duplicate: {filename}"
+                            )
+                        continue
+
+                    seen_hashes.add(data_hash)
+                    all_data.append(parsed_data)
+                    summary['success'] += 1
+
+                except Exception as e:
+                    summary['failed'] += 1
+                    summary['errors'].append((filename, str(e)))
+                    # Create error record so user can see it in the table
+                    all_data.append({
+                        'File Name': filename,
+                        'Error': str(e),
+                    })
+                    if progress_callback:
+                        progress_callback(
+                            i + 1, total, f"❌ Error: {filename} — {e}"
+                        )
+
         return all_data, summary
 
 
@@ -11,6 +11,33 @@ from PIL import Image
 # Supported image file extensions
 SUPPORTED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
 
+# frozenset for O(1) membership tests while scanning folders
+_SUPPORTED_EXTENSIONS_SET = frozenset(SUPPORTED_EXTENSIONS)
+
+# Magic bytes for the supported formats (JPEG, PNG, BMP)
+_IMAGE_MAGIC = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'BM')
+
+
+def is_supported_image(image_path):
+    """
+    Check whether a file is really a supported image via its magic bytes.
+
+    A 12-byte read is far cheaper than letting PIL parse the header, and
+    it catches mislabeled files (e.g. a text file renamed to .png) before
+    they reach the OCR pipeline.
+
+    Args:
+        image_path (str): Path to the file to check.
+
+    Returns:
+        bool: True if the header matches a supported image format.
+    """
+    try:
+        with open(image_path, 'rb') as f:
+            return f.read(12).startswith(_IMAGE_MAGIC)
+    except OSError:
+        return False
+
 
 def load_image_pil(image_path):
     """
@@ -29,6 +56,42 @@ def load_image_pil(image_path):
         return None
 
 
+def iter_images_from_folder(folder_path):
+    """
+    Recursively yield paths to all supported image files under a folder.
+
+    Uses os.scandir so directory/file checks reuse the stat info from the
+    listing itself, and only lower-cases the extension suffix rather than
+    the whole filename. Being a generator, callers can start processing
+    the first image before the scan of a large folder finishes.
+
+    Args:
+        folder_path (str): Path to the folder to scan.
+
+    Yields:
+        str: Absolute path to each image file found.
+    """
+    stack = [folder_path]
+    while stack:
+        # Skip unreadable directories, matching os.walk's default
+        # tolerance (onerror=None) that this scan replaced
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if (dot >= 0
+                            and name[dot:].lower() in _SUPPORTED_EXTENSIONS_SET
+                            and is_supported_image(entry.path)):
+                        yield entry.path
+
+
 def load_images_from_folder(folder_path):
     """
     Recursively scan a folder and return paths to all supported image files.
@@ -39,11 +102,4 @@ def load_images_from_folder(folder_path):
     Returns:
         list[str]: List of absolute paths to image files found.
     """
-    image_files = []
-
-    for root, _, filenames in os.walk(folder_path):
-        for filename in filenames:
-            if filename.lower().endswith(SUPPORTED_EXTENSIONS):
-                image_files.append(os.path.join(root, filename))
-
-    return image_files
+    return list(iter_images_from_folder(folder_path))
@@ -6,11 +6,39 @@ Automatically detects Tesseract installation on Windows.
 """
 
 import os
+import shutil
+import tempfile
+import hashlib
+import logging
+import threading
+import cv2
 import pytesseract
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
 from upi_extractor.utils.image_preprocessing import preprocess_image
 from upi_extractor.core.image_loader import load_image_pil
 
+# Optional in-process backend: the Tesseract C API keeps the language
+# model loaded instead of forking a CLI process per image
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+    _HAS_TESSEROCR = True
+except ImportError:
+    _HAS_TESSEROCR = False
+
+# Tesseract config per extraction source, built once at import — this
+# is consulted for every image in a batch
+_OCR_CONFIGS = {
+    # Screenshots: structured block of text
+    'screenshot': '--psm 6',
+    # Passbook/statements: uniform text layout
+    'passbook': '--psm 6',
+    # Camera photos: auto page segmentation (handles rotation/angles)
+    'camera': '--psm 3',
+    # Auto: let Tesseract decide
+    'auto': '',
+}
+
 
 class OCREngine:
     """
@@ -18,14 +46,142 @@ class OCREngine:
     Auto-detects Tesseract path and provides text extraction.
     """
 
-    def __init__(self):
+    # OCR result cache, one file per content hash. Hashing an image costs
+    # ~1-3 ms against 50-500 ms for OCR, so repeat runs over an unchanged
+    # folder become nearly free. File-per-key keeps concurrent readers
+    # and writers (the thread pool above) safe without a lock or dbm.
+    _CACHE_DIR = os.path.join(
+        os.path.dirname(__file__), '..', 'logs', 'ocr_cache'
+    )
+
+    # Camera photos above this long-side size get downscaled before OCR.
+    # Tesseract runtime scales roughly linearly with pixel count and its
+    # accuracy plateaus well below phone-camera resolutions, so a
+    # 4000-px shot costs ~4x the time of a 2000-px one for the same
+    # text. Screenshots and passbook scans render text at 1:1 pixel
+    # scale and are left alone.
+    _MAX_OCR_DIM = 2500
+
+    def __init__(self, use_cache=True):
+        # Pin each Tesseract invocation to one OpenMP thread: running N
+        # single-threaded instances in parallel beats one instance
+        # fighting itself over cores, and avoids oversubscription when
+        # extract_text_many fans out across a thread pool
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+        self.use_cache = use_cache
         self._configure_tesseract()
 
-    def _configure_tesseract(self):
+        # Error log handler opened once per process, not once per error;
+        # logging's FileHandler is buffered and thread-safe, and delay=
+        # True means no file appears until something actually fails
+        self._logger = logging.getLogger('upi_extractor.ocr')
+        if not self._logger.handlers:
+            log_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
+            os.makedirs(log_dir, exist_ok=True)
+            handler = logging.FileHandler(
+                os.path.join(log_dir, 'ocr_errors.log'),
+                encoding='utf-8', delay=True,
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s: %(message)s'))
+            self._logger.addHandler(handler)
+            self._logger.setLevel(logging.ERROR)
+            self._logger.propagate = False
+
+        # In-process API when tesserocr is installed; pytesseract stays
+        # the fallback (and the batch/list-file path). TessBaseAPI is
+        # not thread-safe, so each worker thread lazily gets its own
+        # handle — the model stays loaded per thread across the whole
+        # batch instead of being shared (a race) or re-forked per call.
+        self._thread_api = threading.local()
+        self._all_apis = []
+        self._apis_lock = threading.Lock()
+
+    def _get_api(self):
+        """Per-thread tesserocr handle, created on first use (or None)."""
+        if not _HAS_TESSEROCR:
+            return None
+        api = getattr(self._thread_api, 'api', None)
+        if api is None and not getattr(self._thread_api, 'failed', False):
+            try:
+                api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK)
+            except Exception:
+                self._thread_api.failed = True
+                return None
+            self._thread_api.api = api
+            with self._apis_lock:
+                self._all_apis.append(api)
+        return api
+
+    def close(self):
+        """Release every tesserocr API handle this engine created."""
+        with self._apis_lock:
+            apis, self._all_apis = self._all_apis, []
+        for api in apis:
+            api.End()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _set_psm(api, source_type, sparse=False):
+        """Point an in-process API at the right page-segmentation mode."""
+        if sparse:
+            psm = PSM.SPARSE_TEXT
+        else:
+            psm = (PSM.AUTO if source_type in ('camera', 'auto')
+                   else PSM.SINGLE_BLOCK)
+        api.SetPageSegMode(psm)
+
+    def _long_edge(self, source_type):
+        """Downscale cap for preprocess_image, per extraction source."""
+        return self._MAX_OCR_DIM if source_type in ('camera', 'auto') else None
+
+    def _cache_key(self, image_path, config):
+        """Content hash of the image bytes plus the OCR config used."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(image_path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(config.encode())
+        return digest.hexdigest()
+
+    def _cache_get(self, key):
+        try:
+            with open(os.path.join(self._CACHE_DIR, key), 'r',
+                      encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _cache_put(self, key, text):
+        try:
+            os.makedirs(self._CACHE_DIR, exist_ok=True)
+            tmp = os.path.join(self._CACHE_DIR, f'.{key}.tmp{os.getpid()}')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp, os.path.join(self._CACHE_DIR, key))
+        except OSError:
+            pass  # cache is best-effort; OCR result is still returned
+
+    # The version probe shells out to Tesseract (~30-50 ms); one engine
+    # per file upstream would repeat it, so configure once per process
+    _configured = False
+
+    @classmethod
+    def _configure_tesseract(cls):
         """
         Attempt to find Tesseract executable in common Windows paths.
         If already accessible via PATH, no action is needed.
+
+        Runs the probe once per process; later instantiations reuse the
+        result via the _configured class flag.
         """
+        if cls._configured:
+            return
+        cls._configured = True
+
         # Check if Tesseract is already accessible
         try:
             pytesseract.get_tesseract_version()
@@ -51,7 +207,8 @@ class OCREngine:
                 pytesseract.pytesseract.tesseract_cmd = path
                 return
 
-    def _get_ocr_config(self, source_type):
+    @staticmethod
+    def _get_ocr_config(source_type):
         """
         Return Tesseract config string based on extraction source type.
 
@@ -61,19 +218,9 @@ class OCREngine:
         Returns:
             str: Tesseract custom config flags.
         """
-        configs = {
-            # Screenshots: structured block of text
-            'screenshot': '--psm 6',
-            # Passbook/statements: uniform text layout
-            'passbook': '--psm 6',
-            # Camera photos: auto page segmentation (handles rotation/angles)
-            'camera': '--psm 3',
-            # Auto: let Tesseract decide
-            'auto': '',
-        }
-        return configs.get(source_type, '')
-
-    def extract_text(self, image_path, source_type="auto"):
+        return _OCR_CONFIGS.get(source_type, '')
+
+    def extract_text(self, image_path, source_type="auto", sparse=False):
         """
         Extract raw text from an image using Tesseract OCR.
 
@@ -83,28 +230,169 @@ class OCREngine:
         Args:
             image_path (str): Path to the image file.
             source_type (str): Source type for OCR config tuning.
+            sparse (bool): Use sparse-text segmentation (PSM 11) instead
+                of the source default — the retry mode for images whose
+                first pass yielded nothing usable.
 
         Returns:
             str: Extracted text, or empty string on failure.
         """
         try:
-            config = self._get_ocr_config(source_type)
+            config = '--psm 11' if sparse else self._get_ocr_config(source_type)
 
-            # Try with preprocessed image first (better OCR accuracy)
-            processed_img = preprocess_image(image_path)
-            if processed_img is not None:
+            # Content-hash cache: identical bytes + config → same text
+            cache_key = None
+            if self.use_cache:
+                cache_key = self._cache_key(image_path, config)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # Try with preprocessed image first (better OCR accuracy);
+            # oversized camera frames are downscaled at load so decode,
+            # denoise and threshold all run on the reduced frame
+            processed_img = preprocess_image(
+                image_path, max_long_edge=self._long_edge(source_type)
+            )
+            api = self._get_api()
+            if api is not None:
+                # In-process API: model already loaded, no fork per image
+                self._set_psm(api, source_type, sparse)
+                if processed_img is not None:
+                    api.SetImage(Image.fromarray(processed_img))
+                else:
+                    api.SetImage(load_image_pil(image_path))
+                text = api.GetUTF8Text()
+            elif processed_img is not None:
                 text = pytesseract.image_to_string(processed_img, config=config)
             else:
                 # Fallback to raw PIL image
                 img = load_image_pil(image_path)
+                if (source_type in ('camera', 'auto')
+                        and max(img.size) > self._MAX_OCR_DIM):
+                    img.thumbnail((self._MAX_OCR_DIM,) * 2, Image.LANCZOS)
                 text = pytesseract.image_to_string(img, config=config)
+
+            if cache_key is not None:
+                self._cache_put(cache_key, text)
             return text
 
         except Exception as e:
-            # Log error silently — will be improved in Step 10
-            log_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
-            os.makedirs(log_dir, exist_ok=True)
-            log_file = os.path.join(log_dir, 'ocr_errors.log')
-            with open(log_file, 'a') as f:
-                f.write(f"{datetime.now()}: Error on {image_path}: {e}\n")
+            self._logger.error("Error on %s: %s", image_path, e)
             return ""
+
+    def extract_text_many(self, image_paths, source_type="auto"):
+        """
+        OCR several images concurrently on a thread pool.
+
+        Each worker runs extract_text, which spends nearly all its time
+        in the Tesseract subprocess — outside the GIL — so throughput
+        scales with cores. OMP_THREAD_LIMIT=1 (set at init) keeps each
+        instance single-threaded so the pool does the parallelism.
+
+        Args:
+            image_paths (list[str]): Paths to the images to process.
+            source_type (str): Source type for OCR config tuning.
+
+        Returns:
+            list[str]: Extracted text per image, in input order.
+        """
+        if not image_paths:
+            return []
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            return list(
+                pool.map(
+                    lambda p: self.extract_text(p, source_type=source_type),
+                    image_paths,
+                )
+            )
+
+    def extract_text_batch(self, image_paths, source_type="auto"):
+        """
+        OCR several images with a single Tesseract invocation.
+
+        Tesseract accepts a text file listing one image path per line and
+        separates the recognized pages with a form-feed, so N images pay
+        one process startup instead of N. Preprocessed frames are written
+        as temporary PNGs; images whose preprocessing fails are listed by
+        their original path so Tesseract reads them directly. Any
+        list-mode failure falls back to the per-image extract_text loop.
+
+        Args:
+            image_paths (list[str]): Paths to the images to process.
+            source_type (str): Source type for OCR config tuning.
+
+        Returns:
+            list[str]: Extracted text per image, in input order.
+        """
+        if not image_paths:
+            return []
+
+        config = self._get_ocr_config(source_type)
+
+        # Serve cache hits up front; only the misses go to Tesseract
+        results = [None] * len(image_paths)
+        miss_indices = list(range(len(image_paths)))
+        if self.use_cache:
+            miss_indices = []
+            for i, path in enumerate(image_paths):
+                try:
+                    key = self._cache_key(path, config)
+                except OSError:
+                    miss_indices.append(i)
+                    continue
+                cached = self._cache_get(key)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    miss_indices.append(i)
+            if not miss_indices:
+                return results
+
+        miss_paths = [image_paths[i] for i in miss_indices]
+        tmp_dir = tempfile.mkdtemp(prefix='upi_ocr_batch_')
+        try:
+            listed_paths = []
+            for i, path in enumerate(miss_paths):
+                processed = preprocess_image(
+                    path, max_long_edge=self._long_edge(source_type)
+                )
+                if processed is not None:
+                    tmp_path = os.path.join(tmp_dir, f'{i}.png')
+                    cv2.imwrite(tmp_path, processed)
+                    listed_paths.append(tmp_path)
+                else:
+                    listed_paths.append(path)
+
+            list_file = os.path.join(tmp_dir, 'imglist.txt')
+            with open(list_file, 'w') as f:
+                f.write('\n'.join(listed_paths))
+
+            output = pytesseract.image_to_string(list_file, config=config)
+            pages = output.split('\x0c')
+            if len(pages) < len(miss_paths):
+                raise ValueError(
+                    f"expected {len(miss_paths)} pages, got {len(pages)}"
+                )
+            for idx, text in zip(miss_indices, pages):
+                results[idx] = text
+                if self.use_cache:
+                    try:
+                        self._cache_put(
+                            self._cache_key(image_paths[idx], config), text
+                        )
+                    except OSError:
+                        pass
+            return results
+
+        except Exception:
+            # List mode is an optimization only — per-image path handles
+            # (and logs) individual failures
+            for idx in miss_indices:
+                results[idx] = self.extract_text(
+                    image_paths[idx], source_type=source_type
+                )
+            return results
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -12,9 +12,20 @@ Features:
 
 import os
 import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
+# Optional: xlsxwriter's constant_memory mode keeps RAM flat on very
+# large exports where even a write-only openpyxl workbook grows
+try:
+    import xlsxwriter
+    _HAS_XLSXWRITER = True
+except ImportError:
+    _HAS_XLSXWRITER = False
+
 
 # ── Style Constants ──────────────────────────────────────────────────
 
@@ -33,6 +44,9 @@ DEBIT_FONT = Font(name="Calibri", size=10, color="9C0006")
 
 SUMMARY_FILL = PatternFill(start_color="D6E4F0", end_color="D6E4F0", fill_type="solid")
 SUMMARY_FONT = Font(name="Calibri", bold=True, size=11, color="1F4E79")
+SUMMARY_ALIGN = Alignment(horizontal="center", vertical="center")
+
+LIGHT_GRAY_FILL = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
 
 THIN_BORDER = Border(
     left=Side(style="thin", color="B0B0B0"),
@@ -48,119 +62,221 @@ AMOUNT_COLUMNS = {
 }
 
 
-def _auto_fit_columns(ws, df):
-    """Adjust column widths to fit the longest value in each column."""
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        # Measure header width
-        max_width = len(str(col_name)) + 4
+def _set_column_widths(ws, df):
+    """
+    Set column widths to fit the longest value in each column.
 
-        # Measure data widths (sample first 100 rows for performance)
-        for row in df.head(100).itertuples(index=False):
-            cell_value = str(row[col_idx - 1]) if row[col_idx - 1] else ''
-            max_width = max(max_width, len(cell_value) + 2)
+    Must run before any rows are appended — write-only worksheets write
+    dimensions ahead of the row data.
+    """
+    for col_idx, width in enumerate(_column_widths(df), start=1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+
+def _column_widths(df):
+    """
+    Width per column fitting the longest value, as a list.
 
-        # Cap to reasonable maximum
-        max_width = min(max_width, 45)
-        ws.column_dimensions[get_column_letter(col_idx)].width = max_width
+    Vectorized max string length over a 200-row sample — one C-level
+    pass per column instead of len(str(...)) per cell in Python.
+    """
+    sample = df.head(200).fillna('').astype(str)
+    data_widths = (
+        sample.apply(lambda c: c.str.len().max()).fillna(0).astype(int)
+        if len(sample) else None
+    )
+
+    widths = []
+    for col_name in df.columns:
+        max_width = len(str(col_name)) + 4
+        if data_widths is not None:
+            max_width = max(max_width, int(data_widths[col_name]) + 2)
+        widths.append(min(max_width, 45))
+    return widths
 
 
-def _style_header(ws, num_cols):
-    """Apply professional styling to the header row."""
-    ws.row_dimensions[1].height = 30
-    for col in range(1, num_cols + 1):
-        cell = ws.cell(row=1, column=col)
+def _header_cells(ws, columns):
+    """Build the styled header row."""
+    cells = []
+    for col_name in columns:
+        cell = WriteOnlyCell(ws, value=col_name)
         cell.fill = HEADER_FILL
         cell.font = HEADER_FONT
         cell.alignment = HEADER_ALIGN
         cell.border = THIN_BORDER
+        cells.append(cell)
+    return cells
 
 
-def _style_data_rows(ws, df, num_rows, num_cols):
-    """Apply formatting to data cells with special treatment for amounts."""
-    amount_col_indices = set()
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        if col_name in AMOUNT_COLUMNS:
-            amount_col_indices.add(col_idx)
+def _data_cells(ws, row_values, shaded, amount_cols, credit_cols, debit_cols):
+    """
+    Build one fully styled data row.
+
+    Styling rules match the old post-write passes: amount columns are
+    right-aligned with a number format, non-empty credit/debit cells get
+    their green/red fill and font, and otherwise every other row is
+    shaded light gray. Amount values arrive already converted to floats
+    by the vectorized pass in export_to_excel.
+
+    Fresh exports pass empty credit/debit sets and let the sheet-level
+    conditional-formatting rules do the coloring instead; the in-place
+    append path keeps per-cell coloring so rows added to workbooks from
+    older versions (which carry no rules) stay consistent.
+    """
+    cells = []
+    for i, val in enumerate(row_values):
+        if val is None or (isinstance(val, float) and pd.isna(val)):
+            val = ''
 
-    for row in range(2, num_rows + 2):  # +2 because header is row 1
-        for col in range(1, num_cols + 1):
-            cell = ws.cell(row=row, column=col)
-            cell.font = DATA_FONT
-            cell.border = THIN_BORDER
-
-            if col in amount_col_indices:
-                cell.alignment = AMOUNT_ALIGN
-                # Try to set number format for amount cells
-                try:
-                    val = float(str(cell.value).replace(',', ''))
-                    cell.value = val
-                    cell.number_format = '#,##0.00'
-                except (ValueError, TypeError):
-                    pass
-            else:
-                cell.alignment = DATA_ALIGN
-
-    # Alternate row shading for readability
-    light_gray = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-    for row in range(3, num_rows + 2, 2):  # Every other row starting from row 3
-        for col in range(1, num_cols + 1):
-            cell = ws.cell(row=row, column=col)
-            if cell.fill == PatternFill():  # Only if not already filled
-                cell.fill = light_gray
-
-
-def _apply_conditional_formatting(ws, df, num_rows):
-    """Color credit cells green and debit cells red."""
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        if 'credit' in col_name.lower() or col_name == 'Amount':
-            for row in range(2, num_rows + 2):
-                cell = ws.cell(row=row, column=col_idx)
-                if cell.value and str(cell.value).strip():
-                    cell.fill = CREDIT_FILL
-                    cell.font = CREDIT_FONT
-
-        elif 'debit' in col_name.lower():
-            for row in range(2, num_rows + 2):
-                cell = ws.cell(row=row, column=col_idx)
-                if cell.value and str(cell.value).strip():
-                    cell.fill = DEBIT_FILL
-                    cell.font = DEBIT_FONT
-
-
-def _add_summary_row(ws, df, num_rows, num_cols):
-    """Add a totals row at the bottom for amount columns."""
-    summary_row = num_rows + 2  # +2 because data starts from row 2
-
-    # Label
-    label_cell = ws.cell(row=summary_row, column=1)
-    label_cell.value = "TOTALS"
-    label_cell.font = SUMMARY_FONT
-    label_cell.fill = SUMMARY_FILL
-    label_cell.border = THIN_BORDER
-    label_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    for col_idx, col_name in enumerate(df.columns, start=1):
-        cell = ws.cell(row=summary_row, column=col_idx)
-        cell.fill = SUMMARY_FILL
+        cell = WriteOnlyCell(ws, value=val)
         cell.border = THIN_BORDER
-        cell.font = SUMMARY_FONT
+        cell.alignment = AMOUNT_ALIGN if i in amount_cols else DATA_ALIGN
+        if i in amount_cols and isinstance(val, float):
+            cell.number_format = '#,##0.00'
+
+        if ((i in credit_cols or i in debit_cols)
+                and val != '' and str(val).strip()):
+            cell.fill = CREDIT_FILL if i in credit_cols else DEBIT_FILL
+            cell.font = CREDIT_FONT if i in credit_cols else DEBIT_FONT
+        else:
+            cell.font = DATA_FONT
+            if shaded:
+                cell.fill = LIGHT_GRAY_FILL
+
+        cells.append(cell)
+    return cells
+
+
+def _add_credit_debit_rules(ws, credit_cols, debit_cols):
+    """
+    Register credit/debit coloring as conditional-formatting rules.
+
+    One rule per column, evaluated by Excel on open — zero Python cost
+    per row, and rows appended later are covered automatically because
+    the range runs to the sheet bottom. The formula mirrors the old
+    per-cell test (non-blank, non-whitespace) and skips the TOTALS row.
+    """
+    for cols, fill, font in ((credit_cols, CREDIT_FILL, CREDIT_FONT),
+                             (debit_cols, DEBIT_FILL, DEBIT_FONT)):
+        for i in cols:
+            letter = get_column_letter(i + 1)
+            ws.conditional_formatting.add(
+                f'{letter}2:{letter}1048576',
+                FormulaRule(
+                    formula=[f'AND(LEN(TRIM({letter}2))>0,$A2<>"TOTALS")'],
+                    fill=fill, font=font,
+                ),
+            )
+
+
+def _column_roles(columns):
+    """Resolve the amount/credit/debit column index sets once."""
+    amount_cols = {i for i, c in enumerate(columns) if c in AMOUNT_COLUMNS}
+    credit_cols = {i for i, c in enumerate(columns)
+                   if 'credit' in str(c).lower() or c == 'Amount'}
+    debit_cols = {i for i, c in enumerate(columns) if 'debit' in str(c).lower()}
+    return amount_cols, credit_cols, debit_cols
+
+
+def _prepare_amounts(df, columns, amount_cols):
+    """
+    Convert amount columns to floats in one vectorized pass per column.
 
-        if col_name in AMOUNT_COLUMNS:
-            # Sum the column values
-            total = 0.0
-            has_values = False
-            for data_row in range(2, num_rows + 2):
-                val = ws.cell(row=data_row, column=col_idx).value
-                try:
-                    total += float(str(val).replace(',', ''))
-                    has_values = True
-                except (ValueError, TypeError):
-                    pass
+    Values that don't parse (OCR junk) keep their original text via a
+    where() merge. Columns that already carry a numeric dtype (e.g. a
+    frame re-read from Excel) skip the string round-trip entirely.
+    Returns the per-column sums for the TOTALS row.
+    """
+    totals, totals_seen = {}, set()
+    for i, col in enumerate(columns):
+        if i not in amount_cols:
+            continue
+        if pd.api.types.is_numeric_dtype(df[col]):
+            numeric = df[col]
+        else:
+            numeric = pd.to_numeric(
+                df[col].astype(str).str.replace(',', '', regex=False),
+                errors='coerce',
+            )
+        if numeric.notna().any():
+            totals[i] = float(numeric.sum(skipna=True))
+            totals_seen.add(i)
+        df[col] = numeric.where(numeric.notna(), df[col])
+    return totals, totals_seen
+
+
+def _summary_cells(ws, columns, totals_seen, num_rows):
+    """
+    Build the TOTALS row as =SUM() formulas over the data range.
 
-            if has_values:
-                cell.value = total
-                cell.number_format = '#,##0.00'
-                cell.alignment = AMOUNT_ALIGN
+    Excel computes the sums on open, so they always agree with the
+    displayed cells (SUM skips text, matching the old Python loop that
+    ignored unparseable values) and never need recomputing on append.
+    """
+    cells = []
+    for i, _ in enumerate(columns):
+        cell = WriteOnlyCell(ws, value='TOTALS' if i == 0 else None)
+        cell.fill = SUMMARY_FILL
+        cell.font = SUMMARY_FONT
+        cell.border = THIN_BORDER
+        if i == 0:
+            cell.alignment = SUMMARY_ALIGN
+        elif i in totals_seen:
+            letter = get_column_letter(i + 1)
+            cell.value = f'=SUM({letter}2:{letter}{num_rows + 1})'
+            cell.number_format = '#,##0.00'
+            cell.alignment = AMOUNT_ALIGN
+        cells.append(cell)
+    return cells
+
+
+def _append_to_existing(df_new, output_path):
+    """
+    Extend an existing export in place instead of rewriting it.
+
+    Opens the workbook, drops the current TOTALS row, appends only the
+    new styled rows and a fresh summary whose =SUM() formulas span the
+    combined data range. Cost scales with the new rows, not the file
+    size. Raises when the sheet layout doesn't accommodate the new
+    columns, letting the caller fall back to the full concat + rewrite
+    path.
+    """
+    wb = load_workbook(output_path)
+    ws = wb['Extracted Data']
+    header = [c.value for c in ws[1]]
+    if not set(df_new.columns) <= set(header):
+        raise ValueError("existing sheet lacks columns for the new rows")
+
+    df = df_new.reindex(columns=header, fill_value='')
+    amount_cols, credit_cols, debit_cols = _column_roles(header)
+    _, totals_seen = _prepare_amounts(df, header, amount_cols)
+
+    # Drop the previous TOTALS row; the replacement formulas cover the
+    # old rows too, so there is nothing to fold in. Columns the old
+    # summary totalled stay totalled even if the new rows are empty.
+    last = ws.max_row
+    if last >= 2 and ws.cell(row=last, column=1).value == 'TOTALS':
+        for i in amount_cols:
+            if ws.cell(row=last, column=i + 1).value not in (None, ''):
+                totals_seen.add(i)
+        ws.delete_rows(last, 1)
+        last -= 1
+
+    existing_rows = last - 1  # minus header
+    for row_idx, row in enumerate(df.itertuples(index=False)):
+        ws.append(_data_cells(
+            ws, row, (existing_rows + row_idx) % 2 == 1,
+            amount_cols, credit_cols, debit_cols,
+        ))
+
+    ws.append(_summary_cells(ws, header, totals_seen, existing_rows + len(df)))
+    wb.save(output_path)
+
+    total_rows = existing_rows + len(df)
+    return True, (
+        f"Appended {len(df_new)} row(s) to {output_path} "
+        f"({total_rows} total rows)"
+    )
 
 
 def export_to_excel(data_list, output_path, append=False):
@@ -198,13 +314,21 @@ def export_to_excel(data_list, output_path, append=False):
         if 'All Extracted Text' in df_new.columns:
             df_new = df_new.drop(columns=['All Extracted Text'])
 
-        # ── Append mode: load existing data and concatenate ──
+        # ── Append mode: extend the sheet in place when possible ──
         if append and os.path.exists(output_path):
+            try:
+                return _append_to_existing(df_new, output_path)
+            except Exception:
+                # Layout mismatch or unreadable file — fall back to the
+                # old read-concat-rewrite path
+                pass
             try:
                 df_existing = pd.read_excel(output_path, engine='openpyxl')
-                # Drop the summary/totals row if present (artifact of formatting)
-                first_col = df_existing.columns[0]
-                df_existing = df_existing[df_existing[first_col] != 'TOTALS']
+                # Drop the summary/totals row (artifact of formatting) —
+                # it is always the last row, so slice it off rather than
+                # masking the whole column
+                if len(df_existing) and df_existing.iloc[-1, 0] == 'TOTALS':
+                    df_existing = df_existing.iloc[:-1]
                 df = pd.concat([df_existing, df_new], ignore_index=True)
                 mode_label = f"Appended {len(df_new)} row(s) to"
             except Exception:
@@ -215,25 +339,148 @@ def export_to_excel(data_list, output_path, append=False):
             mode_label = "Successfully saved to"
 
         num_rows = len(df)
-        num_cols = len(df.columns)
+        columns = list(df.columns)
+
+        # Column roles resolved once, by position; amounts converted in
+        # one vectorized pass per column
+        amount_cols, credit_cols, debit_cols = _column_roles(columns)
+        _, totals_seen = _prepare_amounts(df, columns, amount_cols)
+
+        # Stream rows through a write-only workbook: cells carry their
+        # style at append time, so there is no O(rows × cols) re-styling
+        # pass and memory stays flat regardless of sheet size
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Extracted Data')
+
+        # Dimensions and pane freeze must precede the first append
+        _set_column_widths(ws, df)
+        ws.row_dimensions[1].height = 30
+        ws.freeze_panes = 'A2'
+
+        # Credit/debit coloring is delegated to Excel-side rules, so the
+        # row loop below never branches on those columns
+        _add_credit_debit_rules(ws, credit_cols, debit_cols)
 
-        # Write base data using pandas (creates the workbook)
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Extracted Data')
-            ws = writer.sheets['Extracted Data']
+        ws.append(_header_cells(ws, columns))
 
-            # Apply formatting
-            _style_header(ws, num_cols)
-            _style_data_rows(ws, df, num_rows, num_cols)
-            _apply_conditional_formatting(ws, df, num_rows)
-            _add_summary_row(ws, df, num_rows, num_cols)
-            _auto_fit_columns(ws, df)
+        no_roles = frozenset()
+        for row_idx, row in enumerate(df.itertuples(index=False)):
+            ws.append(_data_cells(
+                ws, row, row_idx % 2 == 1,
+                amount_cols, no_roles, no_roles,
+            ))
 
-            # Freeze top row for scrolling
-            ws.freeze_panes = 'A2'
+        ws.append(_summary_cells(ws, columns, totals_seen, num_rows))
+        wb.save(output_path)
 
         return True, f"{mode_label} {output_path} ({num_rows} total rows)"
 
     except Exception as e:
         return False, f"Error saving Excel: {e}"
 
+
+def export_to_excel_streaming(data_list, output_path):
+    """
+    Constant-memory export for very large batches via xlsxwriter.
+
+    xlsxwriter's constant_memory mode flushes each row to disk as it is
+    written, so RAM stays flat no matter the sheet size. Formatting
+    mirrors export_to_excel (styled header, amount number formats,
+    credit/debit coloring, TOTALS row, frozen header) using a handful of
+    reused format objects. Falls back to export_to_excel when xlsxwriter
+    is not installed. No append mode — streaming writes are one-shot.
+
+    Args:
+        data_list (list[dict]): List of extracted payment records.
+        output_path (str): Destination file path (must end with .xlsx).
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    if not data_list:
+        return False, "No data to export."
+
+    if not _HAS_XLSXWRITER:
+        return export_to_excel(data_list, output_path)
+
+    if not output_path.lower().endswith('.xlsx'):
+        output_path += '.xlsx'
+
+    try:
+        df = pd.DataFrame(data_list)
+        if 'All Extracted Text' in df.columns:
+            df = df.drop(columns=['All Extracted Text'])
+
+        columns = list(df.columns)
+        amount_cols, credit_cols, debit_cols = _column_roles(columns)
+        totals, totals_seen = _prepare_amounts(df, columns, amount_cols)
+
+        wb = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+        ws = wb.add_worksheet('Extracted Data')
+
+        header_fmt = wb.add_format({
+            'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#1F4E79',
+            'align': 'center', 'valign': 'vcenter', 'text_wrap': True,
+            'border': 1,
+        })
+        data_fmt = wb.add_format({
+            'font_name': 'Calibri', 'font_size': 10, 'border': 1,
+        })
+        amount_fmt = wb.add_format({
+            'font_name': 'Calibri', 'font_size': 10, 'border': 1,
+            'align': 'right', 'num_format': '#,##0.00',
+        })
+        credit_fmt = wb.add_format({
+            'font_name': 'Calibri', 'font_size': 10, 'border': 1,
+            'bg_color': '#E2EFDA', 'font_color': '#006100',
+            'num_format': '#,##0.00', 'align': 'right',
+        })
+        debit_fmt = wb.add_format({
+            'font_name': 'Calibri', 'font_size': 10, 'border': 1,
+            'bg_color': '#FCE4EC', 'font_color': '#9C0006',
+            'num_format': '#,##0.00', 'align': 'right',
+        })
+        summary_fmt = wb.add_format({
+            'bold': True, 'font_color': '#1F4E79', 'bg_color': '#D6E4F0',
+            'border': 1,
+        })
+        summary_amount_fmt = wb.add_format({
+            'bold': True, 'font_color': '#1F4E79', 'bg_color': '#D6E4F0',
+            'border': 1, 'align': 'right', 'num_format': '#,##0.00',
+        })
+
+        for i, width in enumerate(_column_widths(df)):
+            ws.set_column(i, i, width)
+        ws.set_row(0, 30)
+        ws.freeze_panes(1, 0)
+
+        ws.write_row(0, 0, columns, header_fmt)
+
+        for r, row in enumerate(df.itertuples(index=False), start=1):
+            for i, val in enumerate(row):
+                if val is None or (isinstance(val, float) and pd.isna(val)):
+                    val = ''
+                non_empty = val != '' and str(val).strip()
+                if i in credit_cols and non_empty:
+                    fmt = credit_fmt
+                elif i in debit_cols and non_empty:
+                    fmt = debit_fmt
+                elif i in amount_cols:
+                    fmt = amount_fmt
+                else:
+                    fmt = data_fmt
+                ws.write(r, i, val, fmt)
+
+        summary_row = len(df) + 1
+        ws.write(summary_row, 0, 'TOTALS', summary_fmt)
+        for i in range(1, len(columns)):
+            if i in totals_seen:
+                ws.write_number(summary_row, i, totals[i], summary_amount_fmt)
+            else:
+                ws.write_blank(summary_row, i, None, summary_fmt)
+
+        wb.close()
+        return True, f"Successfully saved to {output_path} ({len(df)} total rows)"
+
+    except Exception as e:
+        return False, f"Error saving Excel: {e}"
@@ -15,13 +15,14 @@ import customtkinter as ctk
 import os
 import threading
 import webbrowser
+from collections import OrderedDict
 from tkinter import filedialog, messagebox, END
 from datetime import datetime
-from PIL import Image
 
-from upi_extractor.core.extractor import PaymentExtractor
-from upi_extractor.core.image_loader import load_images_from_folder
-from upi_extractor.export.excel_exporter import export_to_excel
+# PaymentExtractor (cv2/pytesseract), the exporter (pandas/openpyxl)
+# and PIL are imported lazily at first use: together they account for
+# most of the app's cold-start time and memory, and none are needed to
+# show the window or pick files
 
 # ─── Appearance Configuration ───────────────────────────────────────
 ctk.set_appearance_mode("dark")
@@ -55,7 +56,7 @@ class PaymentApp(ctk.CTk):
         self._center_window()
 
         # ── State ──
-        self.extractor = PaymentExtractor()
+        self.extractor = None          # built on first extraction
         self.selected_files = []
         self.source_type_var = ctk.StringVar(value="auto")
         self.extracted_data = []       # list[dict] from extraction
@@ -65,10 +66,19 @@ class PaymentApp(ctk.CTk):
         self.processing_summary = {}   # success/fail/duplicate counts
         self.append_var = ctk.BooleanVar(value=False)
         self.theme_var = ctk.StringVar(value="dark")
+        self._thumb_cache = OrderedDict()  # path -> PIL thumbnail (LRU)
+        self._thumb_lock = threading.Lock()  # warm-up thread vs Tk thread
+        self._populate_job = None      # pending after() id for table build
+        self._progress_lock = threading.Lock()
+        self._pending_progress = None  # latest fraction awaiting a flush
 
         # ── Build UI ──
         self._create_widgets()
 
+        # One focus handler for every table cell: cells carry their row
+        # index as an attribute instead of each binding its own closure
+        self.bind_class("Entry", "<FocusIn>", self._on_any_entry_focus, add="+")
+
     # ══════════════════════════════════════════════════════════════════
     #  WINDOW HELPERS
     # ══════════════════════════════════════════════════════════════════
@@ -451,6 +461,11 @@ class PaymentApp(ctk.CTk):
 
     def _populate_results_table(self):
         """Fill the results table with extracted data."""
+        # Cancel a build still in flight from a previous extraction
+        if self._populate_job is not None:
+            self.after_cancel(self._populate_job)
+            self._populate_job = None
+
         # Clear existing entries
         for widget in self.table_scroll.winfo_children():
             widget.destroy()
@@ -483,8 +498,30 @@ class PaymentApp(ctk.CTk):
             )
             lbl.grid(row=0, column=col_idx, padx=2, pady=(2, 4), sticky="w")
 
-        # --- Data rows ---
-        for row_idx, record in enumerate(self.extracted_data, start=1):
+        # Update count label
+        self.result_count_label.configure(
+            text=f"{len(self.extracted_data)} record{'s' if len(self.extracted_data) != 1 else ''}"
+        )
+
+        # Show results frame
+        self.results_frame.pack(fill="both", expand=True, pady=(5, 5), before=self.log_section)
+
+        # --- Data rows, built in slices so the event loop stays live ---
+        self._populate_next_rows(0)
+
+    def _populate_next_rows(self, start, batch=25):
+        """
+        Build one slice of data rows, then hand control back to Tk.
+
+        Creating a CTkEntry per cell is the expensive part of showing
+        results; doing it all at once froze the window for seconds on
+        large extracts. Rendering 25 rows per 16ms tick keeps the UI
+        responsive while the table fills top-down. Export reads from
+        extracted_data, so a table still mid-build exports completely.
+        """
+        end = min(start + batch, len(self.extracted_data))
+        for row_idx in range(start, end):
+            record = self.extracted_data[row_idx]
             row_entries = {}
             for col_idx, col_name in enumerate(self.result_columns):
                 value = str(record.get(col_name, ''))
@@ -498,21 +535,73 @@ class PaymentApp(ctk.CTk):
                     border_width=1,
                 )
                 entry.insert(0, value)
-                entry.grid(row=row_idx, column=col_idx, padx=2, pady=1, sticky="w")
+                entry.grid(row=row_idx + 1, column=col_idx, padx=2, pady=1, sticky="w")
 
-                # Clicking an entry highlights the row and shows thumbnail
-                entry.bind("<FocusIn>", lambda e, idx=row_idx-1: self._on_row_select(idx))
+                # Tag for the class-level <FocusIn> dispatcher
+                entry._row_index = row_idx
 
                 row_entries[col_name] = entry
             self.result_entries.append(row_entries)
 
-        # Update count label
-        self.result_count_label.configure(
-            text=f"{len(self.extracted_data)} record{'s' if len(self.extracted_data) != 1 else ''}"
-        )
-
-        # Show results frame
-        self.results_frame.pack(fill="both", expand=True, pady=(5, 5), before=self.log_section)
+        if end < len(self.extracted_data):
+            self._populate_job = self.after(16, self._populate_next_rows, end)
+        else:
+            self._populate_job = None
+
+    def _get_thumbnail(self, img_path):
+        """
+        Return the decoded, scaled PIL thumbnail for an image path.
+
+        Decode + LANCZOS resampling is the expensive part of a preview
+        (tens of ms on a 4MP screenshot), so thumbnails are kept in a
+        small LRU cache — clicking around the table re-decodes nothing.
+
+        The cache is shared with the warm-up thread and OrderedDict's
+        reordering is not thread-safe, so every touch happens under the
+        lock; the decode itself runs outside it (a duplicate decode in
+        a race just overwrites with an identical thumbnail).
+        """
+        with self._thumb_lock:
+            cached = self._thumb_cache.get(img_path)
+            if cached is not None:
+                self._thumb_cache.move_to_end(img_path)
+                return cached
+
+        from PIL import Image
+
+        pil_img = Image.open(img_path)
+        # Scale to fit thumbnail frame (max 160px wide, aspect ratio preserved)
+        pil_img.thumbnail((160, 250), Image.Resampling.LANCZOS)
+
+        with self._thumb_lock:
+            self._thumb_cache[img_path] = pil_img
+            if len(self._thumb_cache) > 64:
+                self._thumb_cache.popitem(last=False)
+        return pil_img
+
+    def _warm_thumbnails(self, paths):
+        """Background pre-decode so the first row clicks are instant."""
+        for path in paths[:64]:
+            with self._thumb_lock:
+                warm = path in self._thumb_cache
+            if not warm:
+                try:
+                    self._get_thumbnail(path)
+                except Exception:
+                    pass
+
+    def _on_any_entry_focus(self, event):
+        """
+        Class-level dispatcher for table-cell focus.
+
+        CTkEntry wraps an inner tkinter Entry, so the focused widget's
+        master is the cell we tagged with _row_index during population;
+        entries outside the table (e.g. the output path) carry no tag
+        and are ignored.
+        """
+        row_index = getattr(event.widget.master, '_row_index', None)
+        if row_index is not None:
+            self._on_row_select(row_index)
 
     def _on_row_select(self, row_index):
         """Show image thumbnail when a row is selected."""
@@ -521,11 +610,7 @@ class PaymentApp(ctk.CTk):
 
         img_path = self.selected_files[row_index]
         try:
-            pil_img = Image.open(img_path)
-            # Scale to fit thumbnail frame (max 160px wide, aspect ratio preserved)
-            max_w, max_h = 160, 250
-            pil_img.thumbnail((max_w, max_h), Image.Resampling.LANCZOS)
-
+            pil_img = self._get_thumbnail(img_path)
             ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img,
                                    size=pil_img.size)
             self.thumb_label.configure(
@@ -539,23 +624,35 @@ class PaymentApp(ctk.CTk):
                 text=f"Cannot preview\n{os.path.basename(img_path)}",
             )
 
-    def _read_edited_data(self):
-        """Read current values from the editable table, merging with original data."""
-        edited = []
-        for row_idx, row_entries in enumerate(self.result_entries):
+    def _iter_edited_data(self):
+        """
+        Yield export records one at a time, merging table edits over the
+        original data.
+
+        Each record is built exactly once — original fields (minus the
+        raw OCR text) first, then the edited entry values on top — so
+        export never holds a second full copy of the results alongside
+        extracted_data. Rows whose table widgets haven't been built yet
+        (the table fills in slices) export their extracted values as-is.
+        """
+        for row_idx in range(max(len(self.extracted_data),
+                                 len(self.result_entries))):
+            record = {}
             if row_idx < len(self.extracted_data):
-                record = dict(self.extracted_data[row_idx])  # copy original
-            else:
-                record = {}
+                for key, value in self.extracted_data[row_idx].items():
+                    if key != 'All Extracted Text':
+                        record[key] = value
 
             # Overwrite with edited values from table entries
-            for col_name, entry_widget in row_entries.items():
-                record[col_name] = entry_widget.get().strip()
+            if row_idx < len(self.result_entries):
+                for col_name, entry_widget in self.result_entries[row_idx].items():
+                    record[col_name] = entry_widget.get().strip()
 
-            # Remove 'All Extracted Text' from export
-            record.pop('All Extracted Text', None)
-            edited.append(record)
-        return edited
+            yield record
+
+    def _read_edited_data(self):
+        """Read current values from the editable table, merging with original data."""
+        return list(self._iter_edited_data())
 
     # ── Status Section ─────────────────────────────────────────────
 
@@ -674,11 +771,41 @@ class PaymentApp(ctk.CTk):
             self._update_file_label()
 
     def _select_folder(self):
-        """Open folder dialog and scan for images recursively."""
+        """Open folder dialog and scan for images on a background thread."""
         folder = filedialog.askdirectory(title="Select Folder Containing Images")
         if folder:
-            self.selected_files = load_images_from_folder(folder)
-            self._update_file_label()
+            # The recursive scan stats and sniffs every file; on large
+            # or network folders that would hang the UI if run here
+            self._log(f"Scanning {os.path.basename(folder) or folder}...")
+            threading.Thread(
+                target=self._scan_folder_thread,
+                args=(folder,),
+                daemon=True,
+            ).start()
+
+    def _scan_folder_thread(self, folder):
+        """Background thread: scan the folder, then update state on Tk."""
+        from upi_extractor.core.image_loader import load_images_from_folder
+
+        # A failure here would otherwise die with the daemon thread and
+        # leave the UI stuck on "Scanning..." with stale selected_files
+        try:
+            files = load_images_from_folder(folder)
+        except Exception as e:
+            self.after(0, lambda: self._folder_scan_failed(folder, e))
+            return
+        self.after(0, lambda: self._folder_scanned(files))
+
+    def _folder_scanned(self, files):
+        """Apply a finished folder scan on the UI thread."""
+        self.selected_files = files
+        self._update_file_label()
+
+    def _folder_scan_failed(self, folder, error):
+        """Report a failed folder scan on the UI thread."""
+        self._log(f"❌ Could not scan {folder}: {error}")
+        self.selected_files = []
+        self._update_file_label()
 
     def _update_file_label(self):
         """Update the file count label and enable/disable start button."""
@@ -736,6 +863,12 @@ class PaymentApp(ctk.CTk):
     def _extraction_thread(self):
         """Background thread: run extraction pipeline (OCR + parse only)."""
         try:
+            # First run pays the cv2/pytesseract import here, off the
+            # UI thread, rather than at app startup
+            if self.extractor is None:
+                from upi_extractor.core.extractor import PaymentExtractor
+                self.extractor = PaymentExtractor()
+
             source_type = self.source_type_var.get()
             self.extracted_data, self.processing_summary = self.extractor.extract_all(
                 self.selected_files,
@@ -747,13 +880,30 @@ class PaymentApp(ctk.CTk):
             self.after(0, lambda: self._extraction_complete(False, str(e)))
 
     def _update_progress(self, current, total, message):
-        """Callback from extractor — update progress bar and log."""
-        progress = current / total
-        self.after(0, lambda: self.progress_bar.set(progress))
+        """
+        Callback from extractor — update progress bar and log.
+
+        Bar updates are coalesced: the worker just records the latest
+        fraction and at most one flush per 50ms is scheduled, so a fast
+        batch posts ≤20 Tk callbacks a second instead of one per image.
+        """
+        with self._progress_lock:
+            schedule_flush = self._pending_progress is None
+            self._pending_progress = current / total
+        if schedule_flush:
+            self.after(50, self._flush_progress)
 
         if total <= 5 or current % 5 == 0 or current == total:
             self.after(0, lambda: self._log(f"[{current}/{total}] {message}"))
 
+    def _flush_progress(self):
+        """Apply the most recent coalesced progress value to the bar."""
+        with self._progress_lock:
+            progress = self._pending_progress
+            self._pending_progress = None
+        if progress is not None:
+            self.progress_bar.set(progress)
+
     def _extraction_complete(self, success, message):
         """Handle extraction completion — show results table."""
         self.start_btn.configure(state="normal")
@@ -769,6 +919,12 @@ class PaymentApp(ctk.CTk):
             self._populate_results_table()
             self.export_btn.configure(state="normal")
             self._log("Review results below. Edit cells if needed, then click EXPORT.")
+            # Warm the preview cache off the UI thread
+            threading.Thread(
+                target=self._warm_thumbnails,
+                args=(list(self.selected_files),),
+                daemon=True,
+            ).start()
             # Show errors if any
             for fname, err in s.get('errors', []):
                 self._log(f"  ⚠️ {fname}: {err}")
@@ -793,6 +949,8 @@ class PaymentApp(ctk.CTk):
             messagebox.showwarning("No Data", "No extracted data to export.")
             return
 
+        from upi_extractor.export.excel_exporter import export_to_excel
+
         mode_str = "Appending" if append_mode else "Exporting"
         self._log(f"{mode_str} to Excel...")
         success, msg = export_to_excel(data_to_export, output_path, append=append_mode)
@@ -5,40 +5,108 @@ Provides functions to preprocess images before OCR extraction.
 Includes grayscale conversion, thresholding, and denoising.
 """
 
+import mmap
+import os
+
 import cv2
+import numpy as np
+
+# OpenCV's T-API runs the filter/threshold kernels on an OpenCL device
+# (integrated GPUs included) when one is present — wrapping the frame
+# in a UMat is all it takes, and it frees the CPU for the concurrent
+# Tesseract workers. Probed once at import; without a device the
+# ndarray path below is unchanged.
+try:
+    _HAS_OPENCL = cv2.ocl.haveOpenCL()
+    if _HAS_OPENCL:
+        cv2.ocl.setUseOpenCL(True)
+except Exception:
+    _HAS_OPENCL = False
+
+
+def _imread_gray(image_path):
+    """
+    Decode a file straight to grayscale through a memory-mapped buffer.
+
+    cv2.imread first copies the whole file into a private read buffer;
+    mapping it instead lets cv2.imdecode read the OS page cache
+    directly, dropping one full copy of every file in a batch and
+    letting the kernel's readahead keep the disk queue busy.
+
+    Returns:
+        numpy.ndarray or None: Grayscale image, or None if undecodable.
+    """
+    with open(image_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            gray = cv2.imdecode(
+                np.frombuffer(mm, dtype=np.uint8), cv2.IMREAD_GRAYSCALE
+            )
+    return gray
 
 
-def preprocess_image(image_path):
+def preprocess_image(image_path, high_quality=False, max_long_edge=None):
     """
     Reads an image and applies preprocessing to improve OCR accuracy.
 
     Steps:
-        1. Load image with OpenCV
-        2. Convert to grayscale
-        3. Apply Otsu's binarization (separates text from background)
-        4. Denoise the result
+        1. Decode directly to grayscale with OpenCV
+        2. Downscale if larger than max_long_edge (optional)
+        3. Denoise (edge-preserving bilateral filter)
+        4. Apply Otsu's binarization (separates text from background)
+
+    Denoising runs before thresholding — a small bilateral filter smooths
+    sensor noise while keeping glyph edges sharp, and costs a small
+    fraction of the non-local-means pass it replaced (which had little to
+    work with on an already-binary image anyway).
 
     Args:
         image_path (str): Absolute path to the image file.
+        high_quality (bool): Use the slower non-local-means denoiser
+            instead of the bilateral filter.
+        max_long_edge (int or None): If set, downscale images whose long
+            side exceeds this many pixels before any other processing.
 
     Returns:
         numpy.ndarray or None: Preprocessed image array, or None on failure.
     """
     try:
-        img = cv2.imread(image_path)
-        if img is None:
+        # Decode straight to a single channel — the codec fuses the
+        # color→gray conversion into the decode, so a third of the bytes
+        # and no separate cvtColor pass
+        gray = _imread_gray(image_path)
+        if gray is None:
             return None
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # Downscale oversized frames first — every later kernel (and
+        # Tesseract itself) then touches proportionally fewer pixels
+        if max_long_edge:
+            h, w = gray.shape[:2]
+            longest = max(h, w)
+            if longest > max_long_edge:
+                scale = max_long_edge / longest
+                gray = cv2.resize(
+                    gray, (int(w * scale), int(h * scale)),
+                    interpolation=cv2.INTER_AREA,
+                )
 
-        # Apply Otsu's thresholding to binarize
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        # Offload the remaining kernels to the OpenCL device, if any
+        if _HAS_OPENCL:
+            gray = cv2.UMat(gray)
+
+        # Denoise before binarizing
+        if high_quality:
+            denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+        else:
+            denoised = cv2.bilateralFilter(gray, 5, 35, 2)
 
-        # Denoise the binarized image
-        denoised = cv2.fastNlMeansDenoising(thresh, None, 10, 7, 21)
+        # Apply Otsu's thresholding to binarize
+        _, thresh = cv2.threshold(
+            denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
+        )
 
-        return denoised
+        return thresh.get() if _HAS_OPENCL else thresh
 
     except Exception as e:
         print(f"[Preprocessing] Error processing {image_path}: {e}")
@@ -6,12 +6,27 @@ Will provide timestamped file logging for OCR errors,
 skipped images, and duplicate detections.
 """
 
+import logging
+
+# One shared logger and handler: logging formats and writes under a
+# single lock instead of print's format-then-write round trip per
+# call, and later file routing (per the module docstring) becomes a
+# handler swap without touching callsites. The handlers guard keeps
+# re-imports from stacking duplicate handlers, matching the OCR error
+# logger setup in core/ocr_engine.py.
+_log = logging.getLogger('upi_extractor')
+if not _log.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+    _log.addHandler(_handler)
+    _log.setLevel(logging.INFO)
+
 
 def log_info(message):
-    """Print an info-level log message (placeholder)."""
-    print(f"[INFO] {message}")
+    """Log an info-level message."""
+    _log.info(message)
 
 
 def log_error(message):
-    """Print an error-level log message (placeholder)."""
-    print(f"[ERROR] {message}")
+    """Log an error-level message."""
+    _log.error(message)
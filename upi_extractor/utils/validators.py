@@ -5,9 +5,15 @@ Placeholder for future validation functions (Step 4+).
 Will include image quality checks, data validation, etc.
 """
 
+import os
+
+_VALID_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp'})
+
 
 def validate_image_path(path):
     """Check if a path points to a valid image file."""
-    import os
-    valid_extensions = ('.jpg', '.jpeg', '.png', '.bmp')
-    return os.path.isfile(path) and path.lower().endswith(valid_extensions)
+    # Extension first: lowercasing just the suffix is a few bytes
+    # instead of the whole path, and rejecting non-images here skips
+    # the stat syscall inside isfile entirely.
+    return (os.path.splitext(path)[1].lower() in _VALID_EXTENSIONS
+            and os.path.isfile(path))
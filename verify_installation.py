@@ -1,11 +1,23 @@
+import functools
 import pytesseract
 import sys
 import os
 
+@functools.lru_cache(maxsize=1)
+def _tesseract_version():
+    """
+    Probe Tesseract once per process.
+
+    get_tesseract_version spawns a `tesseract --version` subprocess
+    (hundreds of ms); memoizing lets callers use check_tesseract as a
+    repeated health check for free after the first probe.
+    """
+    return pytesseract.get_tesseract_version()
+
 def check_tesseract():
     print("Checking Tesseract Installation...")
     try:
-        version = pytesseract.get_tesseract_version()
+        version = _tesseract_version()
         print(f"✅ Tesseract found! Version: {version}")
         return True
     except pytesseract.TesseractNotFoundError: